@@ -0,0 +1,156 @@
+# File: analytics.py
+# Description: Distribución de grados de separación en el grafo de películas.
+#
+# Para cada actor de origen hace un único BFS completo y de él obtiene el
+# histograma de distancias, la excentricidad y el tamaño de su componente
+# conexa. Con --sample estima la distribución de todos los pares a partir de
+# orígenes aleatorios repartidos entre varios procesos.
+#
+# Requirements: Python 3.9 o superior, sistema con fork (Linux o macOS)
+# Dependencies: degrees y multiprocessing
+#
+# Ejecucion: $ python3 analytics.py large --source "Kevin Bacon"
+#            $ python3 analytics.py large --sample 1000 --processes 32 --json
+#
+# El resto del código va debajo de aquí ---------------------------------------
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import random
+import sys
+
+import degrees
+
+
+def source_stats(source):
+    """
+    Returns the degree-of-separation histogram, eccentricity and
+    connected-component size of source, from a single BFS.
+    """
+    profile = degrees.separation_profile(source)
+    return {
+        "source": source,
+        "name": degrees.people[source]["name"],
+        "histogram": profile,
+        "eccentricity": len(profile) - 1,
+        "component_size": sum(profile),
+    }
+
+
+def sample_all_pairs(sample_size, processes=None, seed=None):
+    """
+    Estimates the all-pairs degree-of-separation distribution from
+    sample_size random sources, computed in parallel worker processes.
+
+    Returns the per-source stats and the aggregated estimate.
+    """
+    person_ids = list(degrees.people)
+    sources = random.Random(seed).sample(person_ids, min(sample_size, len(person_ids)))
+
+    # Los workers heredan el grafo ya cargado mediante fork
+    gc.freeze()
+    with multiprocessing.get_context("fork").Pool(processes) as pool:
+        stats = list(pool.imap_unordered(source_stats, sources, chunksize=4))
+
+    return stats, aggregate(stats, len(person_ids))
+
+
+def aggregate(stats, population):
+    """
+    Combines per-source stats into an estimate over all pairs of
+    the population of people.
+    """
+    histogram = []
+    for source in stats:
+        for distance, count in enumerate(source["histogram"]):
+            if distance == len(histogram):
+                histogram.append(0)
+            histogram[distance] += count
+
+    # La distancia 0 es el propio origen: no cuenta como par
+    pairs = sum(histogram[1:])
+    possible = len(stats) * (population - 1)
+    return {
+        "sources": len(stats),
+        "histogram": histogram[1:],
+        "distribution": [count / pairs for count in histogram[1:]] if pairs else [],
+        "mean_degrees": sum(d * count for d, count in enumerate(histogram) if d) / pairs if pairs else None,
+        "connected_fraction": pairs / possible if possible else None,
+        "max_eccentricity": max((source["eccentricity"] for source in stats), default=None),
+        "max_component_size": max((source["component_size"] for source in stats), default=None),
+    }
+
+
+def print_histogram(title, histogram, first=0):
+    """
+    Prints a histogram list as a table of degrees and counts.
+    """
+    print(title)
+    total = sum(histogram)
+    for distance, count in enumerate(histogram, first):
+        share = count / total if total else 0
+        print(f"  {distance:>3} degrees: {count:>10}  {share:7.2%}  {'#' * round(share * 50)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Degree-of-separation analytics for the movie graph.")
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("-s", "--source", action="append", default=[], metavar="NAME",
+                        help="actor to compute distances from (can be repeated)")
+    parser.add_argument("--sample", type=int, metavar="N",
+                        help="estimate the all-pairs distribution from N random sources")
+    parser.add_argument("-p", "--processes", type=int, default=os.cpu_count(),
+                        help="worker processes for --sample (default: one per core)")
+    parser.add_argument("--seed", type=int, help="random seed for --sample")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="load from (and keep up to date) a binary snapshot of the data")
+    args = parser.parse_args()
+    if not args.source and args.sample is None:
+        parser.error("give at least one --source or --sample N")
+
+    print("Loading data ...", file=sys.stderr)
+    degrees.load_data(args.directory, compact=True, snapshot=args.snapshot)
+    print("Data loaded.", file=sys.stderr)
+
+    results = {"sources": []}
+    for name in args.source:
+        try:
+            source = degrees.person_id_for_name(name, interactive=False)
+        except ValueError as e:
+            sys.exit(str(e))
+        if source is None:
+            sys.exit(f"Person not found: '{name}'")
+        results["sources"].append(source_stats(source))
+
+    if args.sample is not None:
+        _, results["sample"] = sample_all_pairs(args.sample, args.processes, args.seed)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for stats in results["sources"]:
+        print_histogram(f"{stats['name']} ({stats['source']}): eccentricity "
+                        f"{stats['eccentricity']}, component of {stats['component_size']} people",
+                        stats["histogram"])
+    if "sample" in results:
+        sample = results["sample"]
+        # Sin pares conectados en la muestra no hay media ni fracción que mostrar
+        mean = "-" if sample["mean_degrees"] is None else f"{sample['mean_degrees']:.3f}"
+        connected = ("-" if sample["connected_fraction"] is None
+                     else f"{sample['connected_fraction']:.2%}")
+        eccentricity = "-" if sample["max_eccentricity"] is None else sample["max_eccentricity"]
+        print_histogram(f"All pairs estimated from {sample['sources']} sources: "
+                        f"mean {mean} degrees, "
+                        f"{connected} of pairs connected, "
+                        f"max eccentricity {eccentricity}",
+                        sample["histogram"], first=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+# File: benchmark.py
+# Description: Banco de pruebas de los algoritmos de búsqueda de degrees.py.
+#
+# Ejecuta los mismos pares de actores (unos fijos y otros aleatorios) con cada
+# algoritmo y mide, por algoritmo: tiempo de pared por consulta, personas
+# expandidas, tamaño máximo de la frontera, pico de memoria reservada durante
+# la búsqueda (tracemalloc) y pico de RSS del proceso. Cada algoritmo corre en
+# un proceso hijo creado con fork después de cargar los datos, para que sus
+# picos de memoria no se mezclen con los de los demás.
+#
+# Con --synthetic N genera antes un grafo libre de escala de N personas
+# (asignación preferente del reparto de cada película) en formato CSV.
+#
+# Requirements: Python 3.9 o superior, sistema con fork (Linux o macOS)
+# Dependencies: degrees, multiprocessing, resource y tracemalloc
+#
+# Ejecucion: $ python3 benchmark.py small --pairs 50 --json bench.json
+#            $ python3 benchmark.py --synthetic 200000 --compact --pairs 20
+#
+# El resto del código va debajo de aquí ---------------------------------------
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import degrees
+
+# Pares conocidos del conjunto small (se ignoran si no existen en los datos)
+FIXED_PAIRS = [
+    ("Kevin Bacon", "Tom Hanks"),
+    ("Cary Elwes", "Valeria Golino"),
+    ("Mandy Patinkin", "Gerald R. Molen"),
+    ("Chris Sarandon", "Sally Field"),
+    ("Emma Watson", "Jack Nicholson"),
+]
+
+
+class Probe():
+    """
+    Wraps a GraphStore so that searches over it count the people they
+    expand and how many people were reached but not yet expanded.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.reset()
+
+    def __getattr__(self, name):
+        return getattr(self.graph, name)
+
+    def reset(self):
+        self.expanded = 0
+        self.reached = set()
+        self.done = set()
+        self.peak_frontier = 0
+
+    def search_space(self, source, target):
+        source, target, neighbors, decode = self.graph.search_space(source, target)
+        self.reached.add(source)
+
+        def counted_neighbors(person):
+            self.expanded += 1
+            self.done.add(person)
+            pairs = list(neighbors(person))
+            self.reached.update(person_id for _, person_id in pairs)
+            self.peak_frontier = max(self.peak_frontier, len(self.reached) - len(self.done))
+            return pairs
+
+        return source, target, counted_neighbors, decode
+
+
+def generate_scale_free(directory, population, cast=4, movies=None, seed=None):
+    """
+    Writes people.csv, movies.csv and stars.csv for a synthetic graph
+    grown by preferential attachment: every movie casts a few newcomers
+    and fills the rest of its cast with people picked in proportion to
+    the roles they already have, so a few prolific actors get most of
+    the roles as in the real data.
+    """
+    rng = random.Random(seed)
+    movies = movies or population // 2
+    newcomers = min(cast, -(-population // movies))
+
+    with open(os.path.join(directory, "people.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "birth"])
+        for person in range(population):
+            writer.writerow([person, f"Person {person}", 1900 + person % 100])
+
+    # Cada persona aparece en la urna una vez por cada papel que ya tiene
+    urn = []
+    next_person = 0
+    with open(os.path.join(directory, "movies.csv"), "w", newline="", encoding="utf-8") as f, \
+            open(os.path.join(directory, "stars.csv"), "w", newline="", encoding="utf-8") as g:
+        movie_writer = csv.writer(f)
+        star_writer = csv.writer(g)
+        movie_writer.writerow(["id", "title", "year"])
+        star_writer.writerow(["person_id", "movie_id"])
+        for movie in range(movies):
+            movie_writer.writerow([movie, f"Movie {movie}", 1900 + movie % 120])
+            stars = set(range(next_person, min(next_person + newcomers, population)))
+            next_person += len(stars)
+            # Las primeras peliculas no tienen a quien mas repartir: como mucho
+            # entran todas las personas creadas hasta ahora
+            while len(stars) < min(cast, next_person):
+                stars.add(rng.choice(urn))
+            for person in stars:
+                star_writer.writerow([person, movie])
+                urn.append(person)
+
+
+def benchmark_pairs(count, seed=None):
+    """
+    Returns the fixed pairs found in the loaded data plus count
+    random pairs of person_ids.
+    """
+    pairs = []
+    for source_name, target_name in FIXED_PAIRS:
+        source = degrees.names.get(source_name.lower())
+        target = degrees.names.get(target_name.lower())
+        if source and target:
+            pairs.append((min(source), min(target)))
+
+    rng = random.Random(seed)
+    person_ids = list(degrees.people)
+    for _ in range(count):
+        pairs.append(tuple(rng.sample(person_ids, 2)))
+    return pairs
+
+
+def run_algorithm(name, pairs, max_expansions):
+    """
+    Runs every pair with one algorithm and returns its measurements.
+
+    Each pair is run three times: timed on its own, with a Probe to
+    count expansions, and under tracemalloc for peak search memory.
+    """
+    def search(source, target, graph=None):
+        if name == "dfs":
+            return degrees.shortest_path_dfs(source, target, max_expansions, graph=graph)
+        return degrees.ALGORITHMS[name](source, target, graph=graph)
+
+    # A* construye sus landmarks la primera vez: que no cuente en los tiempos
+    if name == "astar" and degrees.store.landmarks is None:
+        degrees.store.build_landmarks()
+
+    probe = Probe(degrees.store)
+    latencies, expanded, frontiers, peaks, lengths = [], [], [], [], []
+    stopped = 0
+    for source, target in pairs:
+        try:
+            start = time.perf_counter()
+            path = search(source, target)
+            latencies.append((time.perf_counter() - start) * 1000)
+        except degrees.SearchBudgetExceeded:
+            stopped += 1
+            continue
+        lengths.append(None if path is None else len(path))
+
+        probe.reset()
+        search(source, target, graph=probe)
+        expanded.append(probe.expanded)
+        frontiers.append(probe.peak_frontier)
+
+        tracemalloc.start()
+        search(source, target)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "algorithm": name,
+        "queries": len(pairs),
+        "stopped": stopped,
+        "lengths": lengths,
+        "total_ms": sum(latencies),
+        "mean_ms": sum(latencies) / len(latencies) if latencies else None,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "mean_expanded": sum(expanded) / len(expanded) if expanded else None,
+        "max_expanded": max(expanded, default=None),
+        "peak_frontier": max(frontiers, default=None),
+        "peak_search_bytes": max(peaks, default=None),
+        # En Linux ru_maxrss va en KiB
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def percentile(values, fraction):
+    """
+    Returns the fraction percentile of sorted values, or None.
+    """
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_benchmark(algorithms, pairs, max_expansions):
+    """
+    Runs each algorithm in its own forked process and returns the
+    results, marking which answers were longer than BFS's.
+    """
+    context = multiprocessing.get_context("fork")
+    results = []
+    for name in algorithms:
+        with context.Pool(1) as pool:
+            results.append(pool.apply(run_algorithm, (name, pairs, max_expansions)))
+
+    reference = next((result["lengths"] for result in results
+                      if result["algorithm"] == "bfs" and not result["stopped"]), None)
+    for result in results:
+        lengths = result.pop("lengths")
+        if reference is not None and not result["stopped"]:
+            result["non_shortest"] = sum(
+                length != shortest for length, shortest in zip(lengths, reference))
+    return results
+
+
+def print_table(results):
+    """
+    Prints the results as a comparison table.
+    """
+    columns = [
+        ("algorithm", "{}"), ("mean_ms", "{:.3f}"), ("p50_ms", "{:.3f}"),
+        ("p95_ms", "{:.3f}"), ("mean_expanded", "{:.1f}"), ("max_expanded", "{}"),
+        ("peak_frontier", "{}"), ("peak_search_bytes", "{}"), ("peak_rss_kib", "{}"),
+        ("stopped", "{}"), ("non_shortest", "{}"),
+    ]
+    rows = [[column for column, _ in columns]]
+    for result in results:
+        rows.append([
+            "-" if result.get(column) is None else style.format(result[column])
+            for column, style in columns
+        ])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    for row in rows:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the degrees search algorithms.")
+    parser.add_argument("directory", nargs="?", default="small")
+    parser.add_argument("-a", "--algorithm", action="append", choices=sorted(degrees.ALGORITHMS),
+                        help="algorithm to run (can be repeated; default: all)")
+    parser.add_argument("--pairs", type=int, default=20,
+                        help="random pairs on top of the fixed ones (default: 20)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument("--compact", action="store_true",
+                        help="search over the compact integer co-star index")
+    parser.add_argument("--max-expansions", type=int, default=100000, metavar="N",
+                        help="expansion budget per dfs query (default: 100000)")
+    parser.add_argument("--synthetic", type=int, metavar="N",
+                        help="benchmark a generated scale-free graph of N people instead")
+    parser.add_argument("--cast", type=int, default=4,
+                        help="stars per movie of the synthetic graph; the first movies get "
+                             "fewer when not enough people exist yet (default: 4)")
+    parser.add_argument("--json", metavar="FILE", help="also write the results as JSON to FILE")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        directory = args.directory
+        if args.synthetic:
+            directory = scratch
+            print(f"Generating {args.synthetic} people ...", file=sys.stderr)
+            generate_scale_free(directory, args.synthetic, args.cast, seed=args.seed)
+
+        print("Loading data ...", file=sys.stderr)
+        start = time.perf_counter()
+        degrees.load_data(directory, compact=args.compact)
+        load_seconds = time.perf_counter() - start
+        print("Data loaded.", file=sys.stderr)
+
+        pairs = benchmark_pairs(args.pairs, args.seed)
+        algorithms = args.algorithm or sorted(degrees.ALGORITHMS)
+        results = run_benchmark(algorithms, pairs, args.max_expansions)
+
+    print(f"{len(degrees.people)} people, {len(degrees.movies)} movies, "
+          f"{len(pairs)} pairs, loaded in {load_seconds:.3f}s")
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "dataset": f"synthetic:{args.synthetic}" if args.synthetic else args.directory,
+                "compact": args.compact,
+                "people": len(degrees.people),
+                "movies": len(degrees.movies),
+                "pairs": len(pairs),
+                "seed": args.seed,
+                "load_seconds": load_seconds,
+                "results": results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
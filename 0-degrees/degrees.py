@@ -7,144 +7,423 @@
 # shortest_path()
 #
 # Requirements: Python 3.9 o superior
-# Dependencies: csv, sys, collections, util y heapq
+# Dependencies: sys, collections, json, util y graph
 #
 # License: MIT License (o la licencia que consideres apropiada)
 #
 # Change log:
 #
-# Ejecucion: $ python3 degress.py large
+# Ejecucion: $ python3 degress.py large [--algorithm dfs]
 #
 # El resto del código va debajo de aquí ---------------------------------------
 
-import csv
+import argparse
+import json
 import sys
-import heapq
 
-from collections import deque
-from util import Node, StackFrontier, QueueFrontier
+from collections import OrderedDict, deque
+from graph import READERS, GraphStore, bfs_levels
+from util import Node, StackFrontier, QueueFrontier, PriorityFrontier
+
+# Graph used by the module-level functions, loaded by load_data()
+store = GraphStore()
 
 # Maps names to a set of corresponding person_ids
-names = {}
+names = store.names
 
 # Maps person_ids to a dictionary of: name, birth, movies (a set of movie_ids)
-people = {}
+people = store.people
 
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
-movies = {}
+movies = store.movies
 
-def load_data(directory):
+def load_data(directory, compact=False, snapshot=False, reader="csv"):
     """
     Load data from CSV files into memory.
+
+    If compact is true, also build the CSR co-star index. If snapshot
+    is true, load everything from the directory's snapshot file when it
+    is up to date, and write a new one after parsing the CSV files
+    otherwise. reader names the CSV layout, a key of graph.READERS.
+    """
+    store.load(directory, reader=reader, compact=compact, snapshot=snapshot)
+
+def build_index():
+    """
+    Builds the compact co-star index used by the searches.
+    """
+    store.build_index()
+
+def ingest_delta(directory):
+    """
+    Adds the people, movies and stars of a delta directory to the data
+    already in memory. Returns False if it had already been applied.
+    """
+    return store.ingest_delta(directory)
+
+def prepare_landmarks(directory, count=8):
+    """
+    Loads the A* landmarks of directory, or builds and saves them
+    if they are missing or out of date.
+    """
+    store.prepare_landmarks(directory, count)
+
+def search_names(text, limit=10, max_distance=2):
+    """
+    Returns up to limit person_ids for a partial or misspelled name.
     """
-    # Load people
-    with open(f"{directory}/people.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            people[row["id"]] = {
-                "name": row["name"],
-                "birth": row["birth"],
-                "movies": set()
-            }
-            if row["name"].lower() not in names:
-                names[row["name"].lower()] = {row["id"]}
-            else:
-                names[row["name"].lower()].add(row["id"])
-
-    # Load movies
-    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            movies[row["id"]] = {
-                "title": row["title"],
-                "year": row["year"],
-                "stars": set()
-            }
-
-    # Load stars
-    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                people[row["person_id"]]["movies"].add(row["movie_id"])
-                movies[row["movie_id"]]["stars"].add(row["person_id"])
-            except KeyError:
-                pass
+    return store.search_names(text, limit, max_distance)
+
+class SearchBudgetExceeded(Exception):
+    """
+    Raised when a search expands more people than it was allowed to.
+    """
+
+# Presupuesto por defecto de dfs en la línea de órdenes y en server.py
+DFS_MAX_EXPANSIONS = 1000000
+
+
+def search_space(source, target, graph=None):
+    """
+    Returns (source, target, neighbors, decode) for a search over graph
+    (by default the one loaded by load_data).
+    """
+    return (graph or store).search_space(source, target)
 
 # Función original BFS (Breadth-First Search)
-def shortest_path_bfs(source, target):
+def shortest_path_bfs(source, target, graph=None):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
 
     If no possible path, returns None.
     """
-    # Inicializar la cola para BFS --------------------------------------
-    queue = deque([(source, [])])
-    visited = set()
+    if source == target:
+        return []
+    source, target, neighbors, decode = search_space(source, target, graph)
 
-    while queue:
-        current_person, path = queue.popleft()
+    # Inicializar la cola para BFS --------------------------------------
+    frontier = QueueFrontier()
+    frontier.add(Node(state=source, parent=None, action=None))
+    visited = {source}
 
-        # Marcar el nodo como visitado
-        visited.add(current_person)
+    while not frontier.empty():
+        node = frontier.remove()
 
         # Obtener todas las conexiones de la persona actual
-        for movie_id, person_id in neighbors_for_person(current_person):
+        for movie_id, person_id in neighbors(node.state):
+            if person_id in visited:
+                continue
+            child = Node(state=person_id, parent=node, action=movie_id)
             if person_id == target:
-                return path + [(movie_id, person_id)]
+                return decode(path_from_node(child))
 
-            if person_id not in visited:
-                queue.append((person_id, path + [(movie_id, person_id)]))
+            # Marcar el nodo como visitado al encolarlo, no al sacarlo
+            visited.add(person_id)
+            frontier.add(child)
 
     # Si no se encuentra el camino
     return None
 
-# Implementación DFS (Depth-First Search)
-def shortest_path_dfs(source, target):
-    def dfs(current_person, path, visited):
-        if current_person == target:
-            return path
-        visited.add(current_person)
-        for movie_id, person_id in neighbors_for_person(current_person):
-            if person_id not in visited:
-                result = dfs(person_id, path + [(movie_id, person_id)], visited)
-                if result:
-                    return result
-        return None
+# Implementación BFS bidireccional (Bidirectional Breadth-First Search)
+def shortest_path_bidirectional(source, target, graph=None):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, searching from both
+    ends at once and always expanding the smaller frontier.
+
+    If no possible path, returns None.
+    """
+    if source == target:
+        return []
+    source, target, neighbors, decode = search_space(source, target, graph)
+
+    # Cada lado guarda, para cada persona alcanzada, (movie_id, persona anterior)
+    forward = {source: None}
+    backward = {target: None}
+    forward_frontier = [source]
+    backward_frontier = [target]
+
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meeting = expand_level(forward_frontier, forward, backward, neighbors)
+        else:
+            backward_frontier, meeting = expand_level(backward_frontier, backward, forward, neighbors)
+
+        # La primera persona alcanzada por ambos lados da un camino mínimo
+        if meeting is not None:
+            return decode(join_paths(forward, backward, meeting))
+
+    return None
+
+def expand_level(frontier, parents, others, neighbors):
+    """
+    Expands a whole BFS level, recording parents as it goes.
+
+    Returns the next level and the first person already reached
+    by the opposite search (or None if the searches did not meet).
+    """
+    next_level = []
+    for current_person in frontier:
+        for movie_id, person_id in neighbors(current_person):
+            if person_id in parents:
+                continue
+            parents[person_id] = (movie_id, current_person)
+            if person_id in others:
+                return next_level, person_id
+            next_level.append(person_id)
+    return next_level, None
+
+def join_paths(forward, backward, meeting):
+    """
+    Builds the (movie_id, person_id) path through the meeting person
+    from the parent maps of a bidirectional search.
+    """
+    path = path_from_parents(forward, meeting)
+
+    person = meeting
+    while backward[person] is not None:
+        movie_id, following = backward[person]
+        path.append((movie_id, following))
+        person = following
+    return path
+
+def path_from_parents(parents, person):
+    """
+    Rebuilds the (movie_id, person_id) path from the root of a
+    parent map, where parents[person] is (movie_id, previous person).
+    """
+    path = []
+    while parents[person] is not None:
+        movie_id, previous = parents[person]
+        path.append((movie_id, person))
+        person = previous
+    path.reverse()
+    return path
+
+def distances_from(source, graph=None):
+    """
+    Returns a dict mapping every person connected to source
+    to their degrees of separation from source.
+    """
+    graph = graph or store
+    root, _, neighbors, _ = search_space(source, source, graph)
+    distances = {}
+    for distance, level in enumerate(bfs_levels(root, neighbors)):
+        for person in level:
+            distances[person] = distance
+    if graph.index is not None:
+        return {graph.index.person_ids[person]: distance for person, distance in distances.items()}
+    return distances
+
+def separation_profile(source, graph=None):
+    """
+    Returns how many people are at each degree of separation from
+    source: element d of the list counts the people d hops away.
+    """
+    root, _, neighbors, _ = search_space(source, source, graph)
+    return [len(level) for level in bfs_levels(root, neighbors)]
+
+class BFSTree():
+    """
+    Breadth-first search tree rooted at one person that only grows as
+    far as needed, so later targets reuse the work done for earlier ones.
+    """
+
+    def __init__(self, source, graph=None):
+        self.source = source
+        self.graph = graph
+        self.root, _, self.neighbors, self.decode = search_space(source, source, graph)
+        self.parents = {self.root: None}
+        self.frontier = deque([self.root])
+
+    def path_to(self, target):
+        """
+        Returns the shortest (movie_id, person_id) path from the root
+        to target, or None if they are not connected.
+        """
+        _, target, _, _ = search_space(self.source, target, self.graph)
+        while target not in self.parents and self.frontier:
+            current_person = self.frontier.popleft()
+            for movie_id, person_id in self.neighbors(current_person):
+                if person_id not in self.parents:
+                    self.parents[person_id] = (movie_id, current_person)
+                    self.frontier.append(person_id)
+
+        if target not in self.parents:
+            return None
+        return self.decode(path_from_parents(self.parents, target))
+
+# Implementación DFS iterativa con profundización (Iterative Deepening DFS)
+def shortest_path_dfs(source, target, max_expansions=None, graph=None):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, using depth-limited DFS
+    with limits 1, 2, 3, ... on an explicit stack instead of recursion.
+
+    Unlike textbook IDDFS, memory is O(people reached), not O(depth):
+    each iteration remembers the shallowest depth at which it reached
+    every person. Without that, a pair with no path would enumerate every
+    simple path in the graph, because there is always a longer one.
+
+    If no possible path, returns None. Raises SearchBudgetExceeded
+    if more than max_expansions people have to be expanded.
+    """
+    if source == target:
+        return []
+    source, target, neighbors, decode = search_space(source, target, graph)
+
+    def unique_neighbors(person):
+        # Un mismo coprotagonista puede aparecer una vez por película compartida
+        seen = set()
+        for movie_id, person_id in neighbors(person):
+            if person_id not in seen:
+                seen.add(person_id)
+                yield movie_id, person_id
+
+    expansions = 0
+    limit = 1
+    while True:
+        # Pila explícita: una persona, la película que lleva a ella y
+        # el iterador de sus vecinos por cada nivel del camino actual
+        path_people = [source]
+        path_movies = [None]
+        stack = [unique_neighbors(source)]
+        expansions += 1
+        # Profundidad mínima a la que se ha llegado a cada persona en esta
+        # iteración: volver a ella igual o más hondo no puede dar nada nuevo
+        reached = {source: 0}
+
+        while stack:
+            step = next(stack[-1], None)
+            if step is None:
+                stack.pop()
+                path_movies.pop()
+                path_people.pop()
+                continue
+
+            movie_id, person_id = step
+            depth = len(stack)
+            if reached.get(person_id, depth + 1) <= depth:
+                continue
+            if person_id == target:
+                return decode(list(zip(path_movies[1:] + [movie_id],
+                                       path_people[1:] + [person_id])))
+            reached[person_id] = depth
+            if depth == limit:
+                continue
+
+            expansions += 1
+            if max_expansions is not None and expansions > max_expansions:
+                raise SearchBudgetExceeded(f"more than {max_expansions} people expanded")
+            path_people.append(person_id)
+            path_movies.append(movie_id)
+            stack.append(unique_neighbors(person_id))
 
-    return dfs(source, [], set())
+        # Al acabar, reached tiene la distancia real de cada persona hasta el
+        # límite: si ninguna queda justo en él, se ha recorrido toda la componente
+        if limit not in reached.values():
+            return None
+        limit += 1
 
 # Implementación GBFS (Greedy Best-First Search)
-def shortest_path_gbfs(source, target):
+def shortest_path_gbfs(source, target, graph=None):
+    source, target, neighbors, decode = search_space(source, target, graph)
+
     def heuristic(person):
         # Esta es una heurística simple. En un caso real, podrías usar una mejor estimación.
         return 1 if person != target else 0
 
-    heap = [(heuristic(source), source, [])]
+    frontier = PriorityFrontier()
+    frontier.add(Node(state=source, parent=None, action=None), heuristic(source))
     visited = set()
 
-    while heap:
-        _, current_person, path = heapq.heappop(heap)
-        if current_person == target:
-            return path
-        visited.add(current_person)
-        for movie_id, person_id in neighbors_for_person(current_person):
-            if person_id not in visited:
-                new_path = path + [(movie_id, person_id)]
-                heapq.heappush(heap, (heuristic(person_id), person_id, new_path))
+    while not frontier.empty():
+        node = frontier.remove()
+        if node.state == target:
+            return decode(path_from_node(node))
+        visited.add(node.state)
+        for movie_id, person_id in neighbors(node.state):
+            if person_id not in visited and not frontier.contains_state(person_id):
+                child = Node(state=person_id, parent=node, action=movie_id)
+                frontier.add(child, heuristic(person_id))
 
     return None
 
-def person_id_for_name(name):
+# Implementación A* con cotas de landmarks (ALT)
+def shortest_path_astar(source, target, graph=None):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, guided by landmark
+    lower bounds so that fewer people are expanded than with BFS.
+
+    If no possible path, returns None.
+    """
+    if source == target:
+        return []
+    graph = graph or store
+    if graph.landmarks is None:
+        graph.build_landmarks()
+    source, target, neighbors, decode = search_space(source, target, graph)
+
+    heuristic = graph.landmarks.heuristic(target)
+    estimate = heuristic(source)
+    if estimate is None:
+        return None
+
+    # Prioridad (f, -g): con igual f se prefiere el mayor coste g, que
+    # está más cerca del objetivo
+    frontier = PriorityFrontier()
+    frontier.add(Node(state=source, parent=None, action=None), (estimate, 0))
+    cost = {source: 0}
+    explored = set()
+
+    while not frontier.empty():
+        node = frontier.remove()
+        if node.state == target:
+            return decode(path_from_node(node))
+        if node.state in explored:
+            continue
+        explored.add(node.state)
+
+        g = cost[node.state] + 1
+        for movie_id, person_id in neighbors(node.state):
+            if person_id in cost and cost[person_id] <= g:
+                continue
+            estimate = heuristic(person_id)
+            if estimate is None:
+                continue
+            cost[person_id] = g
+            frontier.add(Node(state=person_id, parent=node, action=movie_id), (g + estimate, -g))
+
+    return None
+
+def path_from_node(node):
+    """
+    Rebuilds the list of (movie_id, person_id) pairs by following
+    parent pointers from a search node back to the source.
+    """
+    path = []
+    while node.parent is not None:
+        path.append((node.action, node.state))
+        node = node.parent
+    path.reverse()
+    return path
+
+def person_id_for_name(name, interactive=True):
     """
     Returns the IMDB id for a person's name,
     resolving ambiguities as needed.
+
+    If interactive is false, raises ValueError on an ambiguous
+    name instead of asking which person was intended.
     """
     person_ids = list(names.get(name.lower(), set()))
     if len(person_ids) == 0:
         return None
     elif len(person_ids) > 1:
+        if not interactive:
+            raise ValueError(f"ambiguous name '{name}': {', '.join(sorted(person_ids))}")
         print(f"Which '{name}'?")
         for person_id in person_ids:
             person = people[person_id]
@@ -161,38 +440,158 @@ def person_id_for_name(name):
     else:
         return person_ids[0]
 
+def not_found_message(name):
+    """
+    Returns the "Person not found." message, with suggestions for
+    similar names when there are any.
+    """
+    suggestions = [people[person_id]["name"] for person_id in search_names(name, limit=5)]
+    if not suggestions:
+        return "Person not found."
+    return f"Person not found. Did you mean: {', '.join(dict.fromkeys(suggestions))}?"
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
-    movie_ids = people[person_id]["movies"]
-    neighbors = set()
-    for movie_id in movie_ids:
-        for person_id in movies[movie_id]["stars"]:
-            neighbors.add((movie_id, person_id))
-    return neighbors
+    return store.neighbors_for_person(person_id)
+
+def parse_query(line):
+    """
+    Parses a "name<TAB>name" query line into the pair of IMDB ids.
+
+    Raises ValueError if the line is malformed or a name is
+    unknown or ambiguous.
+    """
+    fields = line.split("\t")
+    if len(fields) != 2:
+        raise ValueError("expected 'name<TAB>name'")
+    source_name, target_name = fields
+    source = person_id_for_name(source_name, interactive=False)
+    target = person_id_for_name(target_name, interactive=False)
+    if source is None or target is None:
+        raise ValueError(f"person not found: '{source_name if source is None else target_name}'")
+    return source, target
+
+def path_result(path):
+    """
+    Returns the JSON-serialisable "degrees" and "path" fields of a result.
+    """
+    if path is None:
+        return {"degrees": None, "path": None}
+    return {
+        "degrees": len(path),
+        "path": [
+            {"movie_id": movie_id, "movie": movies[movie_id]["title"],
+             "person_id": person_id, "person": people[person_id]["name"]}
+            for movie_id, person_id in path
+        ],
+    }
+
+def run_batch(lines, output=sys.stdout, tree_cache=16):
+    """
+    Answers one query per line of tab-separated "name<TAB>name" pairs,
+    writing one JSON object per query to output as soon as it is solved.
+
+    BFS trees of the last tree_cache sources are kept, so pairs that
+    share a source actor do not search the graph again from scratch.
+    """
+    trees = OrderedDict()
+    for line in lines:
+        line = line.rstrip("\n")
+        if not line.strip() or line.startswith("#"):
+            continue
+
+        result = {"query": line}
+        try:
+            source, target = parse_query(line)
+        except ValueError as e:
+            result["error"] = str(e)
+            print(json.dumps(result), file=output, flush=True)
+            continue
+        result["source"], result["target"] = source, target
+
+        # Reutilizar (o crear) el árbol BFS de este origen
+        if source in trees:
+            trees.move_to_end(source)
+        else:
+            trees[source] = BFSTree(source)
+            if len(trees) > tree_cache:
+                trees.popitem(last=False)
+        result.update(path_result(trees[source].path_to(target)))
+        print(json.dumps(result), file=output, flush=True)
+
+# Algoritmos de búsqueda seleccionables desde la línea de comandos
+ALGORITHMS = {
+    "astar": shortest_path_astar,
+    "bfs": shortest_path_bfs,
+    "bidirectional": shortest_path_bidirectional,
+    "dfs": shortest_path_dfs,
+    "gbfs": shortest_path_gbfs,
+}
 
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    parser = argparse.ArgumentParser(
+        description="Degrees of separation between two actors.")
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("-a", "--algorithm", choices=sorted(ALGORITHMS),
+                        default="bidirectional", help="search algorithm (default: bidirectional)")
+    parser.add_argument("--format", choices=sorted(READERS), default="csv",
+                        help="layout of the CSV files (default: csv)")
+    parser.add_argument("--compact", action="store_true",
+                        help="search over a compact integer co-star index")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="load from (and keep up to date) a binary snapshot of the data")
+    parser.add_argument("--delta", action="append", default=[], metavar="DIR",
+                        help="add the new people, movies and stars in DIR (can be repeated)")
+    parser.add_argument("--max-expansions", type=int, default=DFS_MAX_EXPANSIONS, metavar="N",
+                        help=f"give up a dfs search after expanding N people "
+                             f"(default: {DFS_MAX_EXPANSIONS})")
+    parser.add_argument("--landmarks", type=int, default=8, metavar="K",
+                        help="landmarks for --algorithm astar (default: 8)")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="answer tab-separated name pairs from FILE ('-' for stdin) "
+                             "with BFS, printing JSON lines")
+    args = parser.parse_args()
+    directory = args.directory
+
+    # En modo batch la salida estándar queda reservada para los resultados
+    log = sys.stderr if args.batch else sys.stdout
 
     # Load data from files into memory
-    print("Loading data ...")
-    load_data(directory)
-    print("Data loaded.")
+    print("Loading data ...", file=log)
+    load_data(directory, compact=args.compact, snapshot=args.snapshot, reader=args.format)
+    for delta in args.delta:
+        ingest_delta(delta)
+    if args.algorithm == "astar":
+        prepare_landmarks(directory, args.landmarks)
+    print("Data loaded.", file=log)
+
+    if args.batch:
+        if args.batch == "-":
+            run_batch(sys.stdin)
+        else:
+            with open(args.batch, encoding="utf-8") as f:
+                run_batch(f)
+        return
 
-    source = person_id_for_name(input("Name Actor 1: "))
+    name = input("Name Actor 1: ")
+    source = person_id_for_name(name)
     if source is None:
-        sys.exit("Person not found.")
-    target = person_id_for_name(input("Name Actor 2: "))
+        sys.exit(not_found_message(name))
+    name = input("Name Actor 2: ")
+    target = person_id_for_name(name)
     if target is None:
-        sys.exit("Person not found.")
+        sys.exit(not_found_message(name))
 
-    #path = shortest_path_bfs(source, target)
-    path = shortest_path_dfs(source, target)
-    #path = shortest_path_gbfs(source, target)
+    try:
+        if args.algorithm == "dfs":
+            path = shortest_path_dfs(source, target, max_expansions=args.max_expansions)
+        else:
+            path = ALGORITHMS[args.algorithm](source, target)
+    except SearchBudgetExceeded as e:
+        sys.exit(f"Search stopped: {e}.")
 
     if path is None:
         print("Not connected.")
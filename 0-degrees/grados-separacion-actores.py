@@ -1,59 +1,38 @@
-import csv
 import sys
-from collections import deque
 
-class GradosSeparacion:
-    def __init__(self, archivo_personas, archivo_peliculas):
-        self.personas = {}
-        self.peliculas = {}
-        self.cargar_datos(archivo_personas, archivo_peliculas)
-
-    def cargar_datos(self, archivo_personas, archivo_peliculas):
-        with open(archivo_personas, encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                self.personas[row["id"]] = {
-                    "name": row["name"],
-                    "movies": set()
-                }
+import degrees
+from graph import GraphStore
 
-        with open(archivo_peliculas, encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                self.peliculas[row["id"]] = {
-                    "title": row["title"],
-                    "stars": set()
-                }
-                for persona_id in row["stars"].split(","):
-                    self.personas[persona_id]["movies"].add(row["id"])
-                    self.peliculas[row["id"]]["stars"].add(persona_id)
+class GradosSeparacion:
+    def __init__(self, conjunto_datos, formato="joined", compacto=True, snapshot=False):
+        # El mismo almacén que usa degrees.py, con el lector de este formato
+        # (películas con los ids de sus protagonistas separados por comas)
+        self.grafo = GraphStore()
+        self.grafo.load(conjunto_datos, reader=formato, compact=compacto, snapshot=snapshot)
+        self.personas = self.grafo.people
+        self.peliculas = self.grafo.movies
 
     def encontrar_actor(self, nombre):
-        for persona_id, persona in self.personas.items():
-            if persona["name"].lower() == nombre.lower():
-                return persona_id
-        return None
-
-    def encontrar_conexion(self, inicio, fin):
-        if inicio == fin:
-            return []
-
-        visitados = set()
-        cola = deque([(inicio, [])])
+        personas = self.grafo.name_index.exact(nombre)
+        return personas[0] if personas else None
 
-        while cola:
-            (nodo, path) = cola.popleft()
-            if nodo not in visitados:
-                visitados.add(nodo)
+    def sugerir_actores(self, texto, limite=10):
+        # Autocompletado por prefijo y, si no basta, nombres parecidos
+        sugerencias = self.grafo.search_names(texto, limite)
+        return [self.personas[persona_id]["name"] for persona_id in sugerencias]
 
-                for pelicula_id in self.personas[nodo]["movies"]:
-                    for actor_id in self.peliculas[pelicula_id]["stars"]:
-                        if actor_id == fin:
-                            return path + [(nodo, pelicula_id, actor_id)]
-                        if actor_id not in visitados:
-                            cola.append((actor_id, path + [(nodo, pelicula_id, actor_id)]))
-
-        return None
+    def encontrar_conexion(self, inicio, fin):
+        camino = degrees.shortest_path_bidirectional(inicio, fin, graph=self.grafo)
+        if camino is None:
+            return None
+
+        # Pasar de pares (película, actor) a ternas (actor anterior, película, actor)
+        conexion = []
+        nodo = inicio
+        for pelicula_id, actor_id in camino:
+            conexion.append((nodo, pelicula_id, actor_id))
+            nodo = actor_id
+        return conexion
 
     def imprimir_conexion(self, conexion):
         if conexion is None:
@@ -68,15 +47,13 @@ class GradosSeparacion:
             print(f"{i}: {nombre_actor1} y {nombre_actor2} protagonizaron {titulo_pelicula}")
 
 def main():
-    if len(sys.argv) != 2:
-        sys.exit("Uso: python grados.py [conjunto_datos]")
+    if len(sys.argv) not in (2, 3) or (len(sys.argv) == 3 and sys.argv[2] != "--snapshot"):
+        sys.exit("Uso: python grados.py [conjunto_datos] [--snapshot]")
 
     conjunto_datos = sys.argv[1]
-    archivo_personas = f"{conjunto_datos}/people.csv"
-    archivo_peliculas = f"{conjunto_datos}/movies.csv"
 
     print("Cargando datos...")
-    grafo = GradosSeparacion(archivo_personas, archivo_peliculas)
+    grafo = GradosSeparacion(conjunto_datos, snapshot=len(sys.argv) == 3)
     print("Datos cargados.")
 
     while True:
@@ -85,7 +62,7 @@ def main():
             break
         actor1 = grafo.encontrar_actor(nombre1)
         if actor1 is None:
-            print("Actor no encontrado.")
+            print("Actor no encontrado.", *grafo.sugerir_actores(nombre1, 5), sep="\n  ")
             continue
 
         nombre2 = input("Nombre: ").strip()
@@ -93,7 +70,7 @@ def main():
             break
         actor2 = grafo.encontrar_actor(nombre2)
         if actor2 is None:
-            print("Actor no encontrado.")
+            print("Actor no encontrado.", *grafo.sugerir_actores(nombre2, 5), sep="\n  ")
             continue
 
         conexion = grafo.encontrar_conexion(actor1, actor2)
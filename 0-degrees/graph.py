@@ -0,0 +1,647 @@
+# File: graph.py
+# Description: Almacén del grafo de actores y películas compartido por
+# degrees.py y grados-separacion-actores.py.
+#
+# GraphStore guarda los diccionarios names, people y movies, el índice de
+# nombres, el índice compacto (CSR) de coprotagonistas, los landmarks de A*
+# y el snapshot binario. Los datos se cargan con lectores intercambiables,
+# uno por cada formato de CSV:
+#
+#   csv     people.csv (id, name, birth), movies.csv (id, title, year) y
+#           stars.csv (person_id, movie_id), el formato de degrees.py
+#   joined  people.csv (id, name) y movies.csv (id, title, stars), con los
+#           ids de los protagonistas separados por comas en "stars"
+#
+# Requirements: Python 3.9 o superior
+# Dependencies: csv, array, mmap, pickle y nameindex
+#
+# El resto del código va debajo de aquí ---------------------------------------
+
+import csv
+import gc
+import heapq
+import itertools
+import mmap
+import os
+import pickle
+import struct
+
+from array import array
+from nameindex import NameIndex
+
+# CSV files of a dataset directory
+DATA_FILES = ("people.csv", "movies.csv", "stars.csv")
+
+# On-disk snapshot of a dataset: header, pickled signature and dicts,
+# then the CSR arrays as raw 4-byte integers
+SNAPSHOT_FILE = "degrees.snapshot"
+SNAPSHOT_MAGIC = b"DEGREES\0"
+SNAPSHOT_VERSION = 4
+SNAPSHOT_HEADER = struct.Struct("<8sIQQ")
+
+# On-disk landmark distances: header, pickled signature, landmark
+# ids as 4-byte integers and one byte per person and landmark
+LANDMARKS_FILE = "degrees.landmarks"
+LANDMARKS_MAGIC = b"LANDMARK"
+LANDMARKS_VERSION = 3
+LANDMARKS_HEADER = struct.Struct("<8sIIIQ")
+UNREACHABLE = 255
+
+
+class GraphStore():
+    """
+    People, movies and the indexes built over them.
+    """
+
+    def __init__(self):
+        # Maps names to a set of corresponding person_ids
+        self.names = {}
+
+        # Maps person_ids to a dictionary of: name, birth, movies (a set of movie_ids)
+        self.people = {}
+
+        # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
+        self.movies = {}
+
+        # NameIndex for prefix and fuzzy lookups of people by name
+        self.name_index = None
+
+        # Optional CompactIndex over people/movies, built by build_index()
+        self.index = None
+
+        # Optional LandmarkIndex for A*, built by build_landmarks()
+        self.landmarks = None
+
+        # Format of the loaded data, as a key of READERS
+        self.reader = "csv"
+
+        # Signatures of the delta directories applied by ingest_delta()
+        self.applied_deltas = []
+
+        # Directory whose snapshot is kept up to date, set by load(snapshot=True)
+        self.snapshot_directory = None
+
+    def load(self, directory, reader="csv", compact=False, snapshot=False):
+        """
+        Loads the dataset in directory with the given reader.
+
+        If compact is true, also build the CSR co-star index. If snapshot
+        is true, load everything from the directory's snapshot file when it
+        is up to date, and write a new one after reading the CSV files
+        otherwise.
+        """
+        self.reader = reader
+        self.applied_deltas = []
+        self.snapshot_directory = directory if snapshot else None
+        if snapshot and self.load_snapshot(directory):
+            return
+
+        self.names.clear()
+        self.people.clear()
+        self.movies.clear()
+        self.name_index = None
+        self.index = None
+        self.landmarks = None
+        READERS[reader](self, directory)
+        self.build_name_index()
+
+        if compact or snapshot:
+            self.build_index()
+        if snapshot:
+            self.save_snapshot(directory)
+
+    def add_person(self, person_id, name, birth):
+        """
+        Adds a person, or updates the name and birth of a known one,
+        keeping the indexes up to date.
+        """
+        person = self.people.get(person_id)
+        if person is None:
+            self.people[person_id] = {
+                "name": name,
+                "birth": birth,
+                "movies": set()
+            }
+            if self.index is not None:
+                self.index.add_person(person_id)
+        elif person["name"] != name:
+            self.names[person["name"].lower()].discard(person_id)
+            if self.name_index is not None:
+                self.name_index.remove(person["name"], person_id)
+            person["name"], person["birth"] = name, birth
+        else:
+            person["birth"] = birth
+            return
+
+        if name.lower() not in self.names:
+            self.names[name.lower()] = {person_id}
+        else:
+            self.names[name.lower()].add(person_id)
+        if self.name_index is not None:
+            self.name_index.add(name, person_id)
+
+    def add_movie(self, movie_id, title, year):
+        """
+        Adds a movie, or updates the title and year of a known one.
+        """
+        movie = self.movies.setdefault(movie_id, {"stars": set()})
+        movie["title"], movie["year"] = title, year
+
+    def add_star(self, person_id, movie_id):
+        """
+        Records that person_id starred in movie_id, linking them with
+        the rest of the cast. Unknown people or movies are skipped.
+        """
+        if person_id not in self.people or movie_id not in self.movies:
+            return
+        stars = self.movies[movie_id]["stars"]
+        if person_id in stars:
+            return
+        if self.index is not None:
+            self.index.add_star(person_id, movie_id, stars)
+        self.people[person_id]["movies"].add(movie_id)
+        stars.add(person_id)
+
+    def build_index(self):
+        """
+        Builds the compact co-star index used by the searches.
+        """
+        self.index = CompactIndex.from_data(self.people, self.movies)
+        self.landmarks = None
+
+    def build_name_index(self):
+        """
+        Builds the name index over everyone in people.
+        """
+        self.name_index = NameIndex.from_pairs(
+            (person["name"], person_id) for person_id, person in self.people.items())
+
+    def search_names(self, text, limit=10, max_distance=2):
+        """
+        Returns up to limit person_ids for a partial or misspelled name:
+        names starting with text first, then the closest names within
+        max_distance edits.
+        """
+        matches = self.name_index.prefix(text, limit)
+        if len(matches) < limit:
+            for _, person_id in self.name_index.fuzzy(text, max_distance, limit):
+                if person_id not in matches:
+                    matches.append(person_id)
+        return matches[:limit]
+
+    def neighbors_for_person(self, person_id):
+        """
+        Returns (movie_id, person_id) pairs for people
+        who starred with a given person.
+        """
+        movie_ids = self.people[person_id]["movies"]
+        neighbors = set()
+        for movie_id in movie_ids:
+            for person_id in self.movies[movie_id]["stars"]:
+                neighbors.add((movie_id, person_id))
+        return neighbors
+
+    def search_space(self, source, target):
+        """
+        Returns (source, target, neighbors, decode) for a search: integer ids
+        over the compact index when it exists, IMDB ids otherwise.
+        """
+        if self.index is None:
+            return source, target, self.neighbors_for_person, lambda path: path
+        return (self.index.person_index[source], self.index.person_index[target],
+                self.index.neighbors, self.index.decode_path)
+
+    def signature(self, directory):
+        """
+        Returns the reader and the (file, size, mtime) triples that a
+        snapshot of directory is valid for.
+        """
+        signature = [self.reader]
+        for filename in DATA_FILES:
+            path = os.path.join(directory, filename)
+            if os.path.exists(path):
+                stat = os.stat(path)
+                signature.append((filename, stat.st_size, stat.st_mtime_ns))
+        return signature
+
+    def save_snapshot(self, directory):
+        """
+        Writes names, people, movies and the compact index to the
+        snapshot file of directory.
+        """
+        if self.index is None:
+            self.build_index()
+        index = self.index
+
+        signature = pickle.dumps(self.signature(directory), pickle.HIGHEST_PROTOCOL)
+        metadata = pickle.dumps({
+            "names": self.names,
+            "name_keys": self.name_index.keys,
+            "name_ids": self.name_index.ids,
+            "people": self.people,
+            "movies": self.movies,
+            "person_ids": index.person_ids,
+            "movie_ids": index.movie_ids,
+            "extra": index.extra,
+            "deltas": self.applied_deltas,
+            "lengths": [len(index.offsets), len(index.neighbor_people)],
+        }, pickle.HIGHEST_PROTOCOL)
+
+        path = os.path.join(directory, SNAPSHOT_FILE)
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+                                         len(signature), len(metadata)))
+            f.write(signature)
+            f.write(metadata)
+            for values in (index.offsets, index.neighbor_people, index.neighbor_movies):
+                # Alinear cada array para poder hacer cast sobre el mmap
+                f.write(b"\0" * (-f.tell() % 8))
+                f.write(array("i", values).tobytes())
+        os.replace(f"{path}.tmp", path)
+
+    def load_snapshot(self, directory):
+        """
+        Loads names, people, movies and the compact index from the
+        snapshot file of directory, memory-mapping the adjacency arrays.
+
+        Returns False if there is no snapshot, or it is from another
+        version or reader or stale with respect to the CSV files.
+        """
+        path = os.path.join(directory, SNAPSHOT_FILE)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return False
+
+        with f:
+            header = f.read(SNAPSHOT_HEADER.size)
+            if len(header) < SNAPSHOT_HEADER.size:
+                return False
+            magic, version, signature_size, metadata_size = SNAPSHOT_HEADER.unpack(header)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                return False
+            if pickle.loads(f.read(signature_size)) != self.signature(directory):
+                return False
+
+            # Desactivar el recolector acelera mucho el unpickle de dicts enormes
+            gc.disable()
+            try:
+                metadata = pickle.loads(f.read(metadata_size))
+            finally:
+                gc.enable()
+
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        arrays = []
+        position = SNAPSHOT_HEADER.size + signature_size + metadata_size
+        for length in (metadata["lengths"][0], metadata["lengths"][1], metadata["lengths"][1]):
+            position += -position % 8
+            end = position + length * 4
+            arrays.append(memoryview(mapped)[position:end].cast("i"))
+            position = end
+
+        self.names.clear()
+        self.names.update(metadata["names"])
+        self.name_index = NameIndex(metadata["name_keys"], metadata["name_ids"])
+        self.people.clear()
+        self.people.update(metadata["people"])
+        self.movies.clear()
+        self.movies.update(metadata["movies"])
+        self.index = CompactIndex(metadata["person_ids"], metadata["movie_ids"], *arrays,
+                                  extra=metadata["extra"])
+        self.applied_deltas = metadata["deltas"]
+        self.landmarks = None
+        return True
+
+    def ingest_delta(self, directory, reader=None):
+        """
+        Adds the people, movies and stars of a delta directory (in the
+        format of reader, by default the one the data was loaded with)
+        to the data already in memory.
+
+        The name index and compact index are updated in place, the landmarks
+        are dropped (new links can make their bounds inadmissible) and the
+        snapshot, if one is in use, is rewritten. Returns False if the same
+        delta had already been applied.
+        """
+        signature = (os.path.abspath(directory), self.signature(directory))
+        if signature in self.applied_deltas:
+            return False
+
+        READERS[reader or self.reader](self, directory)
+
+        self.applied_deltas.append(signature)
+        self.landmarks = None
+        if self.snapshot_directory is not None:
+            self.save_snapshot(self.snapshot_directory)
+        return True
+
+    def build_landmarks(self, count=8):
+        """
+        Builds the landmark index (and the compact index it needs).
+        """
+        if self.index is None:
+            self.build_index()
+        self.landmarks = LandmarkIndex.from_index(self.index, count)
+
+    def save_landmarks(self, directory):
+        """
+        Writes the landmark distances next to the data of directory.
+        """
+        signature = pickle.dumps([self.signature(directory), self.applied_deltas],
+                                 pickle.HIGHEST_PROTOCOL)
+        path = os.path.join(directory, LANDMARKS_FILE)
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(LANDMARKS_HEADER.pack(LANDMARKS_MAGIC, LANDMARKS_VERSION,
+                                          len(self.landmarks.people),
+                                          len(self.index.person_ids), len(signature)))
+            f.write(signature)
+            f.write(array("i", self.landmarks.people).tobytes())
+            for distances in self.landmarks.distances:
+                f.write(distances)
+        os.replace(f"{path}.tmp", path)
+
+    def load_landmarks(self, directory, count=8):
+        """
+        Loads the landmark distances of directory, memory-mapped.
+
+        Returns False if the file is missing, from another version, has
+        a different number of landmarks or is stale.
+        """
+        if self.index is None:
+            self.build_index()
+
+        path = os.path.join(directory, LANDMARKS_FILE)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return False
+
+        with f:
+            header = f.read(LANDMARKS_HEADER.size)
+            if len(header) < LANDMARKS_HEADER.size:
+                return False
+            magic, version, stored_count, population, signature_size = LANDMARKS_HEADER.unpack(header)
+            if (magic != LANDMARKS_MAGIC or version != LANDMARKS_VERSION
+                    or stored_count != count or population != len(self.index.person_ids)):
+                return False
+            signature = pickle.loads(f.read(signature_size))
+            if signature != [self.signature(directory), self.applied_deltas]:
+                return False
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        position = LANDMARKS_HEADER.size + signature_size
+        hubs = list(array("i", mapped[position:position + 4 * count]))
+        position += 4 * count
+        distances = []
+        for _ in range(count):
+            distances.append(memoryview(mapped)[position:position + population])
+            position += population
+        self.landmarks = LandmarkIndex(hubs, distances)
+        return True
+
+    def prepare_landmarks(self, directory, count=8):
+        """
+        Loads the landmarks of directory, or builds and saves them
+        if they are missing or out of date.
+        """
+        if not self.load_landmarks(directory, count):
+            self.build_landmarks(count)
+            self.save_landmarks(directory)
+
+
+def read_split_csv(graph, directory):
+    """
+    Reads a dataset with separate people, movies and stars files.
+    """
+    # Load people
+    with open(os.path.join(directory, "people.csv"), encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            graph.add_person(row["id"], row["name"], row["birth"])
+
+    # Load movies
+    path = os.path.join(directory, "movies.csv")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                graph.add_movie(row["id"], row["title"], row["year"])
+
+    # Load stars
+    path = os.path.join(directory, "stars.csv")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                graph.add_star(row["person_id"], row["movie_id"])
+
+
+def read_joined_csv(graph, directory):
+    """
+    Reads a dataset whose movies list their stars as comma-joined ids.
+    """
+    with open(os.path.join(directory, "people.csv"), encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            graph.add_person(row["id"], row["name"], row.get("birth", ""))
+
+    path = os.path.join(directory, "movies.csv")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                graph.add_movie(row["id"], row["title"], row.get("year", ""))
+                for person_id in row["stars"].split(","):
+                    graph.add_star(person_id, row["id"])
+
+
+# Lectores disponibles, por nombre de formato
+READERS = {
+    "csv": read_split_csv,
+    "joined": read_joined_csv,
+}
+
+
+class CompactIndex():
+    """
+    Co-star adjacency in CSR form over integer ids.
+
+    The neighbors of person i are stored in positions
+    offsets[i] .. offsets[i + 1] of the neighbor_people and
+    neighbor_movies arrays. Co-stars added after the arrays were built
+    are kept in the extra dict, as lists of (movie, person) pairs.
+    """
+
+    def __init__(self, person_ids, movie_ids, offsets, neighbor_people, neighbor_movies,
+                 extra=None):
+        # Traducción entre ids de IMDB (strings) e índices enteros
+        self.person_ids = person_ids
+        self.person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+        self.movie_ids = movie_ids
+        self.movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+
+        # Pueden ser array("i") o memoryviews sobre un snapshot mapeado en memoria
+        self.offsets = offsets
+        self.neighbor_people = neighbor_people
+        self.neighbor_movies = neighbor_movies
+        self.extra = {} if extra is None else extra
+
+    @classmethod
+    def from_data(cls, people, movies):
+        """
+        Builds the index from the people and movies dictionaries.
+        """
+        person_ids = list(people)
+        person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+        movie_ids = list(movies)
+        movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+
+        stars = [
+            [person_index[person_id] for person_id in movies[movie_id]["stars"]]
+            for movie_id in movie_ids
+        ]
+
+        offsets = array("i", [0])
+        neighbor_people = array("i")
+        neighbor_movies = array("i")
+        for i, person_id in enumerate(person_ids):
+            for movie_id in people[person_id]["movies"]:
+                j = movie_index[movie_id]
+                for k in stars[j]:
+                    if k != i:
+                        neighbor_people.append(k)
+                        neighbor_movies.append(j)
+            offsets.append(len(neighbor_people))
+
+        return cls(person_ids, movie_ids, offsets, neighbor_people, neighbor_movies)
+
+    def neighbors(self, i):
+        """
+        Returns (movie, person) integer pairs for the co-stars of person i.
+        """
+        extra = self.extra.get(i)
+        if i + 1 >= len(self.offsets):
+            return extra or ()
+        start, end = self.offsets[i], self.offsets[i + 1]
+        neighbors = zip(self.neighbor_movies[start:end], self.neighbor_people[start:end])
+        return neighbors if extra is None else itertools.chain(neighbors, extra)
+
+    def degree(self, i):
+        """
+        Returns the number of (movie, person) co-star pairs of person i.
+        """
+        degree = len(self.extra.get(i, ()))
+        if i + 1 < len(self.offsets):
+            degree += self.offsets[i + 1] - self.offsets[i]
+        return degree
+
+    def add_person(self, person_id):
+        """
+        Gives person_id an integer id, if it does not have one yet.
+        """
+        if person_id not in self.person_index:
+            self.person_index[person_id] = len(self.person_ids)
+            self.person_ids.append(person_id)
+        return self.person_index[person_id]
+
+    def add_movie(self, movie_id):
+        """
+        Gives movie_id an integer id, if it does not have one yet.
+        """
+        if movie_id not in self.movie_index:
+            self.movie_index[movie_id] = len(self.movie_ids)
+            self.movie_ids.append(movie_id)
+        return self.movie_index[movie_id]
+
+    def add_star(self, person_id, movie_id, co_stars):
+        """
+        Links person_id with each of co_stars through movie_id.
+        """
+        i = self.add_person(person_id)
+        j = self.add_movie(movie_id)
+        for co_star in co_stars:
+            k = self.add_person(co_star)
+            if k != i:
+                self.extra.setdefault(i, []).append((j, k))
+                self.extra.setdefault(k, []).append((j, i))
+
+    def decode_path(self, path):
+        """
+        Maps a path of integer (movie, person) pairs back to IMDB ids.
+        """
+        if path is None:
+            return None
+        return [(self.movie_ids[m], self.person_ids[p]) for m, p in path]
+
+
+class LandmarkIndex():
+    """
+    BFS distances from a few landmark people to everyone, used as an
+    admissible A* heuristic through the triangle inequality.
+
+    distances[l][i] is the distance from landmark l to person i of the
+    compact index, or UNREACHABLE.
+    """
+
+    def __init__(self, people, distances):
+        self.people = people
+        self.distances = distances
+
+    @classmethod
+    def from_index(cls, index, count):
+        """
+        Picks the count people with the most co-stars as landmarks
+        and runs one BFS from each of them.
+        """
+        degree = [index.degree(i) for i in range(len(index.person_ids))]
+        hubs = heapq.nlargest(count, range(len(degree)), key=degree.__getitem__)
+
+        distances = []
+        for hub in hubs:
+            hub_distances = bytearray([UNREACHABLE]) * len(degree)
+            for distance, level in enumerate(bfs_levels(hub, index.neighbors)):
+                for person in level:
+                    hub_distances[person] = min(distance, UNREACHABLE - 1)
+            distances.append(hub_distances)
+        return cls(hubs, distances)
+
+    def heuristic(self, target):
+        """
+        Returns a function giving a lower bound on the distance from a
+        person to target, or None if they cannot be connected.
+        """
+        columns = [(distances, distances[target]) for distances in self.distances]
+
+        def lower_bound(person):
+            bound = 0
+            for distances, target_distance in columns:
+                distance = distances[person]
+                if distance == target_distance:
+                    continue
+                # Un landmark que alcanza a uno solo de los dos prueba que
+                # están en componentes distintas
+                if distance == UNREACHABLE or target_distance == UNREACHABLE:
+                    return None
+                bound = max(bound, abs(distance - target_distance))
+            return bound
+
+        return lower_bound
+
+
+def bfs_levels(root, neighbors):
+    """
+    Yields the people at distance 0, 1, 2, ... from root, one list per
+    BFS level, using ids of the given neighbors function.
+    """
+    visited = {root}
+    level = [root]
+    while level:
+        yield level
+        next_level = []
+        for current_person in level:
+            for _, person_id in neighbors(current_person):
+                if person_id not in visited:
+                    visited.add(person_id)
+                    next_level.append(person_id)
+        level = next_level
@@ -0,0 +1,162 @@
+# File: server.py
+# Description: Servidor de consultas de grados de separación en paralelo.
+#
+# Carga el grafo una sola vez con degrees.load_data() y después crea un pool
+# de procesos con fork, de modo que todos los workers comparten los datos en
+# modo copy-on-write (o a través del mmap del snapshot). Cada consulta es una
+# línea "nombre<TAB>nombre" y cada respuesta una línea JSON con la latencia.
+#
+# Requirements: Python 3.9 o superior, sistema con fork (Linux o macOS)
+# Dependencies: degrees, multiprocessing y socketserver
+#
+# Ejecucion: $ python3 server.py large --snapshot --workers 32
+#            $ python3 server.py large --socket /tmp/degrees.sock
+#
+# El resto del código va debajo de aquí ---------------------------------------
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import signal
+import socketserver
+import sys
+import time
+
+import degrees
+
+
+def solve(task):
+    """
+    Answers one query line inside a worker process.
+
+    Returns the JSON result with the query latency in milliseconds.
+    """
+    line, algorithm, max_expansions = task
+    start = time.perf_counter()
+    result = {"query": line}
+    try:
+        source, target = degrees.parse_query(line)
+        result["source"], result["target"] = source, target
+        if algorithm == "dfs":
+            path = degrees.shortest_path_dfs(source, target, max_expansions=max_expansions)
+        else:
+            path = degrees.ALGORITHMS[algorithm](source, target)
+        result.update(degrees.path_result(path))
+    except (ValueError, degrees.SearchBudgetExceeded) as e:
+        result["error"] = str(e)
+    result["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    result["worker"] = os.getpid()
+    return result
+
+
+def queries(lines, algorithm, max_expansions=None):
+    """
+    Yields (line, algorithm, max_expansions) tasks for the non-empty,
+    non-comment lines.
+    """
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.strip() and not line.startswith("#"):
+            yield line, algorithm, max_expansions
+
+
+def start_pool(workers):
+    """
+    Forks the worker pool once the graph is loaded in this process.
+    """
+    # Congelar los objetos ya cargados evita que el recolector de los workers
+    # los recorra y rompa el copy-on-write de las páginas compartidas
+    gc.freeze()
+    return multiprocessing.get_context("fork").Pool(workers, initializer=ignore_interrupts)
+
+
+def ignore_interrupts():
+    """
+    Leaves Ctrl-C to the parent process, which shuts the pool down.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def serve_stdin(pool, algorithm, max_expansions=None):
+    """
+    Answers queries from stdin in order and prints a latency
+    summary to stderr when the input ends.
+    """
+    latencies = []
+    start = time.perf_counter()
+    for result in pool.imap(solve, queries(sys.stdin, algorithm, max_expansions)):
+        latencies.append(result["latency_ms"])
+        print(json.dumps(result), flush=True)
+    elapsed = time.perf_counter() - start
+
+    if latencies:
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{len(latencies)} queries in {elapsed:.3f}s "
+              f"({len(latencies) / elapsed:.1f} queries/s), "
+              f"p50 {p50:.3f} ms, p99 {p99:.3f} ms", file=sys.stderr)
+
+
+def serve_socket(pool, algorithm, path, max_expansions=None):
+    """
+    Answers queries from any number of clients on a Unix socket.
+
+    Each connection is served by its own thread, which streams the
+    client's lines to the shared pool and writes results back in order.
+    """
+    class QueryHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            lines = (line.decode("utf-8") for line in self.rfile)
+            for result in pool.imap(solve, queries(lines, algorithm, max_expansions)):
+                self.wfile.write(json.dumps(result).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+    if os.path.exists(path):
+        os.unlink(path)
+    with socketserver.ThreadingUnixStreamServer(path, QueryHandler) as server:
+        print(f"Listening on {path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Parallel degrees of separation query server.")
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("-a", "--algorithm", choices=sorted(degrees.ALGORITHMS),
+                        default="bidirectional", help="search algorithm (default: bidirectional)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: one per core)")
+    parser.add_argument("--max-expansions", type=int, default=degrees.DFS_MAX_EXPANSIONS,
+                        metavar="N", help=f"give up a dfs query after expanding N people "
+                                          f"(default: {degrees.DFS_MAX_EXPANSIONS})")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="serve a Unix socket at PATH instead of stdin")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="load from (and keep up to date) a binary snapshot of the data")
+    args = parser.parse_args()
+
+    print("Loading data ...", file=sys.stderr)
+    # El índice compacto son unos pocos arrays grandes: se comparten mucho
+    # mejor entre procesos que millones de tuplas y sets
+    degrees.load_data(args.directory, compact=True, snapshot=args.snapshot)
+    if args.algorithm == "astar":
+        degrees.prepare_landmarks(args.directory)
+    print("Data loaded.", file=sys.stderr)
+
+    with start_pool(args.workers) as pool:
+        if args.socket:
+            serve_socket(pool, args.algorithm, args.socket, args.max_expansions)
+        else:
+            serve_stdin(pool, args.algorithm, args.max_expansions)
+
+
+if __name__ == "__main__":
+    main()
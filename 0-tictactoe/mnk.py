@@ -0,0 +1,446 @@
+# File: mnk.py
+# Description: Motor generalizado de juegos m,n,k (tableros m x n, gana quien
+# alinea k fichas): el Tres en raya es el 3,3,3.
+#
+# MNKGame ofrece la misma API que tictactoe.py (initial_state, player,
+# actions, result, winner, terminal, utility y minimax) para cualquier
+# tamaño. En tableros grandes el minimax completo es inviable, asi que
+# minimax() hace profundizacion iterativa con poda alpha-beta dentro de un
+# presupuesto de tiempo por jugada y, al llegar a la profundidad maxima de
+# cada iteracion, puntua el tablero con una heuristica: cada ventana de k
+# casillas que solo contiene fichas de un jugador suma (o resta) tanto mas
+# cuantas mas fichas tenga. Devuelve la mejor jugada de la ultima iteracion
+# completa. Una tabla de transposiciones (claves Zobrist) guarda la mejor
+# jugada y la cota de cada posicion ya buscada.
+#
+# parallel_minimax() reparte las jugadas de la raiz entre un grupo de
+# procesos: en cada profundidad cada proceso busca las jugadas que le tocan
+# con su copia de la tabla, devuelve las entradas nuevas (que se fusionan en
+# la tabla del proceso principal) y los nodos que ha visitado.
+#
+# Requirements: Python 3.9 o superior
+# Dependencies: argparse, multiprocessing, os, random, time
+#
+# Ejecucion: $ python3 mnk.py --rows 4 --cols 4 --k 3 --budget 1.0
+#            $ python3 mnk.py --rows 5 --cols 5 --k 4 --budget 2.0
+#            $ python3 mnk.py --rows 5 --cols 5 --k 4 --budget 2.0 --processes 4
+#
+# El resto del código va debajo de aquí ---------------------------------------
+
+import argparse
+import multiprocessing
+import os
+import random
+import time
+
+X = "X"
+O = "O"
+EMPTY = None
+
+# Tipo de cota guardada en la tabla de transposiciones
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Entradas de la tabla a partir de las cuales se vacia
+TABLE_LIMIT = 1000000
+
+# Partida de cada proceso de parallel_minimax(), creada por init_worker()
+worker_game = None
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the move's time budget runs out.
+    """
+
+
+class MNKGame():
+    """
+    An m x n board where the first player to get k in a row wins.
+    """
+
+    def __init__(self, rows=3, cols=3, k=3):
+        if not 1 <= k <= max(rows, cols):
+            raise ValueError(f"k={k} does not fit on a {rows}x{cols} board")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+
+        # Todas las ventanas de k casillas seguidas (filas, columnas y las
+        # dos diagonales) y, para cada casilla, las ventanas que la contienen
+        self.windows = []
+        for i in range(rows):
+            for j in range(cols):
+                for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= end_i < rows and 0 <= end_j < cols:
+                        self.windows.append(tuple((i + di * s, j + dj * s) for s in range(k)))
+        self.windows_through = {(i, j): [] for i in range(rows) for j in range(cols)}
+        for window in self.windows:
+            for cell in window:
+                self.windows_through[cell].append(window)
+
+        # Una victoria vale mas que cualquier suma de la heuristica
+        self.weights = [0] + [10 ** count for count in range(k)]
+        self.win_score = len(self.windows) * 10 ** k + 1
+
+        # Orden de prueba de las casillas: de la mas central a la mas alejada
+        center_i, center_j = (rows - 1) / 2, (cols - 1) / 2
+        self.order = sorted(self.windows_through,
+                            key=lambda cell: abs(cell[0] - center_i) + abs(cell[1] - center_j))
+
+        # Claves Zobrist: un numero al azar por casilla y ficha; la clave de un
+        # tablero es el XOR de los de sus fichas
+        rng = random.Random(f"{rows}x{cols}x{k}")
+        self.zobrist = {cell: {X: rng.getrandbits(64), O: rng.getrandbits(64)}
+                        for cell in self.windows_through}
+        # Clave -> (profundidad, puntuacion, tipo de cota, mejor jugada)
+        self.transpositions = {}
+        # Entradas escritas durante la tarea de un proceso de parallel_minimax()
+        # (None fuera de ellos)
+        self.written = None
+
+        self.nodes = 0
+        self.depth = 0
+        self.worker_nodes = {}
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[EMPTY] * self.cols for _ in range(self.rows)]
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board.
+        """
+        x_count = sum(row.count(X) for row in board)
+        o_count = sum(row.count(O) for row in board)
+        return O if x_count > o_count else X
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        return {(i, j) for i in range(self.rows) for j in range(self.cols)
+                if board[i][j] == EMPTY}
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if not (0 <= i < self.rows and 0 <= j < self.cols) or board[i][j] != EMPTY:
+            raise ValueError("Invalid action")
+        new_board = [row[:] for row in board]
+        new_board[i][j] = self.player(board)
+        return new_board
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        for window in self.windows:
+            i, j = window[0]
+            first = board[i][j]
+            if first != EMPTY and all(board[a][b] == first for a, b in window):
+                return first
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return self.winner(board) is not None or all(cell != EMPTY for row in board for cell in row)
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        winner_player = self.winner(board)
+        if winner_player == X:
+            return 1
+        elif winner_player == O:
+            return -1
+        else:
+            return 0
+
+    def evaluate(self, board):
+        """
+        Returns a heuristic score of a non-terminal board, positive when
+        it favours X: every window held by only one player counts 10 to
+        the number of pieces it has in it.
+        """
+        score = 0
+        for window in self.windows:
+            x_count = o_count = 0
+            for i, j in window:
+                if board[i][j] == X:
+                    x_count += 1
+                elif board[i][j] == O:
+                    o_count += 1
+            if not o_count:
+                score += self.weights[x_count]
+            elif not x_count:
+                score -= self.weights[o_count]
+        return score
+
+    def wins_at(self, board, cell):
+        """
+        Returns True if the piece just placed on cell completes a window.
+        """
+        piece = board[cell[0]][cell[1]]
+        return any(all(board[i][j] == piece for i, j in window)
+                   for window in self.windows_through[cell])
+
+    def board_hash(self, board):
+        """
+        Returns the Zobrist key of the board.
+        """
+        key = 0
+        for (i, j), pieces in self.zobrist.items():
+            if board[i][j] != EMPTY:
+                key ^= pieces[board[i][j]]
+        return key
+
+    def store(self, key, entry):
+        """
+        Saves a transposition entry, also recording it in written when a
+        worker task is collecting the entries it writes.
+        """
+        if len(self.transpositions) >= TABLE_LIMIT:
+            self.transpositions.clear()
+        self.transpositions[key] = entry
+        if self.written is not None:
+            self.written[key] = entry
+
+    def negamax(self, board, depth, alpha, beta, piece, empty, deadline, key):
+        """
+        Returns the score of the board for piece, the player to move,
+        searching depth plies with alpha-beta pruning. The board is
+        changed in place and restored before returning; key is its
+        Zobrist key.
+        """
+        self.nodes += 1
+        if time.perf_counter() > deadline:
+            raise SearchTimeout
+        if not empty:
+            return 0
+        if depth == 0:
+            score = self.evaluate(board)
+            return score if piece == X else -score
+
+        # En un juego de colocar fichas cada posicion esta siempre a la misma
+        # distancia de la raiz, asi que solo una entrada de la misma
+        # profundidad vale como cota; las demas solo aportan su mejor jugada
+        entry = self.transpositions.get(key)
+        order = self.order
+        if entry is not None:
+            entry_depth, score, flag, first = entry
+            if entry_depth == depth and (flag == EXACT
+                                         or (flag == LOWER and score >= beta)
+                                         or (flag == UPPER and score <= alpha)):
+                return score
+            order = [first] + [cell for cell in self.order if cell != first]
+
+        original_alpha = alpha
+        other = O if piece == X else X
+        # Por debajo de cualquier puntuacion posible, perder incluida
+        best = -self.win_score - depth - 1
+        best_move = None
+        for i, j in order:
+            if board[i][j] != EMPTY:
+                continue
+            board[i][j] = piece
+            if self.wins_at(board, (i, j)):
+                # Cuanto antes se gana, mejor
+                score = self.win_score + depth
+            else:
+                score = -self.negamax(board, depth - 1, -beta, -alpha, other, empty - 1,
+                                      deadline, key ^ self.zobrist[i, j][piece])
+            board[i][j] = EMPTY
+            if score > best:
+                best = score
+                best_move = (i, j)
+            if best >= beta:
+                break
+            alpha = max(alpha, best)
+
+        flag = UPPER if best <= original_alpha else LOWER if best >= beta else EXACT
+        self.store(key, (depth, best, flag, best_move))
+        return best
+
+    def root_score(self, board, move, depth, alpha, deadline):
+        """
+        Returns the score of playing move on the board, searching depth
+        plies in total with the root window (alpha, win).
+        """
+        piece = self.player(board)
+        other = O if piece == X else X
+        work = [row[:] for row in board]
+        work[move[0]][move[1]] = piece
+        if self.wins_at(work, move):
+            return self.win_score + depth
+        empty = sum(row.count(EMPTY) for row in work)
+        key = self.board_hash(work)
+        return -self.negamax(work, depth - 1, -self.win_score - depth - 1,
+                             -alpha, other, empty, deadline, key)
+
+    def root_moves(self, board):
+        """
+        Returns the empty cells of the board in search order.
+        """
+        return [cell for cell in self.order if board[cell[0]][cell[1]] == EMPTY]
+
+    def minimax(self, board, budget=1.0, max_depth=None):
+        """
+        Returns the best action for the current player on the board found
+        by iterative deepening within budget seconds.
+        """
+        if self.terminal(board):
+            return None
+
+        deadline = time.perf_counter() + budget
+        empty = sum(row.count(EMPTY) for row in board)
+        max_depth = min(max_depth or empty, empty)
+
+        moves = self.root_moves(board)
+        best_action = moves[0]
+        self.nodes = 0
+        self.depth = 0
+        for depth in range(1, max_depth + 1):
+            scores = {}
+            alpha = -self.win_score - depth - 1
+            try:
+                for move in moves:
+                    scores[move] = self.root_score(board, move, depth, alpha, deadline)
+                    alpha = max(alpha, scores[move])
+            except SearchTimeout:
+                break
+
+            # La siguiente iteracion empieza por las mejores jugadas de esta
+            moves.sort(key=lambda move: -scores[move])
+            best_action = moves[0]
+            self.depth = depth
+            # Victoria o derrota forzada: mas profundidad no la cambia
+            if abs(scores[best_action]) > self.win_score - 1:
+                break
+        return best_action
+
+    def parallel_minimax(self, board, budget=1.0, processes=None, max_depth=None):
+        """
+        Returns the best action found by iterative deepening within budget
+        seconds, searching the root moves in a pool of worker processes.
+        Leaves the nodes each worker visited in worker_nodes.
+        """
+        if self.terminal(board):
+            return None
+
+        deadline = time.perf_counter() + budget
+        empty = sum(row.count(EMPTY) for row in board)
+        max_depth = min(max_depth or empty, empty)
+
+        moves = self.root_moves(board)
+        best_action = moves[0]
+        self.nodes = 0
+        self.depth = 0
+        self.worker_nodes = {}
+        # Cada proceso arranca con una copia de la tabla actual
+        with multiprocessing.Pool(processes, init_worker,
+                                  (self.rows, self.cols, self.k, self.transpositions)) as pool:
+            for depth in range(1, max_depth + 1):
+                # Sin ventana compartida entre procesos: cada jugada se busca
+                # con la ventana completa para que su puntuacion sea exacta
+                tasks = [(board, move, depth, deadline) for move in moves]
+                results = pool.map(root_worker, tasks, chunksize=1)
+
+                timed_out = False
+                scores = {}
+                for move, (score, pid, count, entries) in zip(moves, results):
+                    self.worker_nodes[pid] = self.worker_nodes.get(pid, 0) + count
+                    self.nodes += count
+                    for key, entry in entries:
+                        self.store(key, entry)
+                    if score is None:
+                        timed_out = True
+                    scores[move] = score
+                if timed_out:
+                    break
+
+                moves.sort(key=lambda move: -scores[move])
+                best_action = moves[0]
+                self.depth = depth
+                if abs(scores[best_action]) > self.win_score - 1:
+                    break
+        return best_action
+
+
+def init_worker(rows, cols, k, transpositions):
+    """
+    Creates the game of a parallel_minimax() worker process.
+    """
+    global worker_game
+    worker_game = MNKGame(rows, cols, k)
+    worker_game.transpositions = transpositions
+
+
+def root_worker(task):
+    """
+    Returns the score of one root move (None if the deadline passed),
+    the worker's pid, the nodes it visited and the transposition
+    entries it wrote.
+    """
+    board, move, depth, deadline = task
+    game = worker_game
+    game.nodes = 0
+    game.written = {}
+    try:
+        score = game.root_score(board, move, depth, -game.win_score - depth - 1, deadline)
+    except SearchTimeout:
+        score = None
+    return score, os.getpid(), game.nodes, list(game.written.items())
+
+
+def print_board(board):
+    """
+    Prints the board with "." for empty cells.
+    """
+    for row in board:
+        print(" ".join(cell or "." for cell in row))
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play an m,n,k-game between two copies of the time-limited AI.")
+    parser.add_argument("--rows", type=int, default=3, help="board rows (default: 3)")
+    parser.add_argument("--cols", type=int, default=3, help="board columns (default: 3)")
+    parser.add_argument("--k", type=int, default=3, help="pieces in a row to win (default: 3)")
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="seconds per move (default: 1.0)")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="worker processes splitting the root moves (default: 1)")
+    args = parser.parse_args()
+
+    game = MNKGame(args.rows, args.cols, args.k)
+    board = game.initial_state()
+    while not game.terminal(board):
+        start = time.perf_counter()
+        if args.processes > 1:
+            action = game.parallel_minimax(board, args.budget, args.processes)
+        else:
+            action = game.minimax(board, args.budget)
+        elapsed = time.perf_counter() - start
+        print(f"{game.player(board)} plays {action}: depth {game.depth}, "
+              f"{game.nodes} nodes, {elapsed:.3f}s")
+        if args.processes > 1:
+            print("  nodes per worker: " + ", ".join(
+                f"{pid}: {count}" for pid, count in sorted(game.worker_nodes.items())))
+        board = game.result(board, action)
+        print_board(board)
+
+    winner = game.winner(board)
+    print("Game Over: Tie." if winner is None else f"Game Over: {winner} wins.")
+
+
+if __name__ == "__main__":
+    main()
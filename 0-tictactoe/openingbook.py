@@ -0,0 +1,80 @@
+# File: openingbook.py
+# Description: Genera el libro de aperturas del Tres en raya.
+#
+# Recorre todas las posiciones alcanzables desde el tablero vacio (menos de
+# 6000), resuelve cada una con el minimax del motor elegido y escribe una
+# linea por posicion no terminal:
+#
+#     <tablero> <jugada> <valor>
+#
+# donde <tablero> son las 9 casillas por filas ("X", "O" o "."), <jugada> es
+# la casilla 3 * i + j de la mejor jugada y <valor> es 1, 0 o -1 (gana X,
+# tablas, gana O). tictactoe.py y tictactoev3.py leen este fichero y
+# responden con una sola consulta en lugar de buscar.
+#
+# Requirements: Python 3.9 o superior
+# Dependencies: argparse, importlib, tictactoesearch.py, tictactoe.py o tictactoev3.py
+#
+# Ejecucion: $ python3 openingbook.py
+#            $ python3 openingbook.py --engine tictactoev3 --output openingbook.txt
+#
+# El resto del código va debajo de aquí ---------------------------------------
+
+import argparse
+import importlib
+
+import tictactoesearch as search
+
+
+def reachable_positions(ttt):
+    """
+    Returns every board reachable from the initial state, keyed by
+    its board key.
+    """
+    positions = {}
+    pending = [ttt.initial_state()]
+    while pending:
+        board = pending.pop()
+        key = search.board_key(board)
+        if key in positions:
+            continue
+        positions[key] = board
+        if not ttt.terminal(board):
+            pending.extend(ttt.result(board, action) for action in ttt.actions(board))
+    return positions
+
+
+def solve(ttt):
+    """
+    Returns the book lines of every reachable non-terminal position,
+    solved by the engine's own search.
+    """
+    # Sin libro: el motor tiene que buscar de verdad
+    ttt.book = {}
+    lines = []
+    for key, board in sorted(reachable_positions(ttt).items()):
+        if ttt.terminal(board):
+            continue
+        i, j = ttt.minimax(board)
+        lines.append(f"{key} {3 * i + j} {ttt.value(board)}\n")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Solve every reachable tic-tac-toe position into an opening book.")
+    parser.add_argument("--engine", default="tictactoe", choices=["tictactoe", "tictactoev3"],
+                        help="engine whose minimax solves the positions (default: tictactoe)")
+    parser.add_argument("--output", help="book file (default: openingbook.txt next to the engines)")
+    args = parser.parse_args()
+
+    ttt = importlib.import_module(args.engine)
+    lines = solve(ttt)
+    output = args.output or search.BOOK_FILE
+    with open(output, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    print(f"{len(lines)} positions written to {output}")
+
+
+if __name__ == "__main__":
+    main()
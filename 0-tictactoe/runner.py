@@ -7,12 +7,16 @@
 # player(), actions(), result(), winner(), terminal(), utility() y minimax()
 #
 # Requirements: Python 3.9 o superior
-# Dependencies: pygame, sys, time, tictactoe.py, tictactoev2.py o tictactoev3.py
+# Dependencies: pygame, sys, threading, tictactoe.py, tictactoev2.py, tictactoev3.py o tictactoev4.py
 #
 # License: MIT License (o la licencia que consideres apropiada)
 #
 # Change log:
 # - Creacion de una version con un boton nuevo para que resuelva solo la jugada con una IA especial.
+# - La IA calcula su jugada en un hilo aparte y el bucle la consulta en cada fotograma,
+#   asi la ventana no se congela; el dibujo va limitado a FPS fotogramas por segundo y
+#   los clics se leen como eventos en lugar de esperar con time.sleep().
+#   Si la busqueda falla, el hilo deja la excepcion y el bucle principal la relanza.
 #
 # Ejecucion: $ python3 runner.py
 #
@@ -20,14 +24,23 @@
 #
 import pygame
 import sys
-import time
+import threading
 
-# Version primera de la solucion de juego mediante minimax
-#import tictactoe as ttt
-# Version de una solucion de ChatGPT
+# Version primera de la solucion de juego mediante minimax (con alpha-beta)
+import tictactoe as ttt
+# Version de una solucion de ChatGPT (con alpha-beta)
 #import tictactoev3 as ttt
-# Otra version de codigo de minimax
-import tictactoev2 as ttt
+# Version sobre bitboards (dos enteros de 9 bits) con poda alpha-beta
+#import tictactoev4 as ttt
+# Otra version de codigo de minimax, sin poda: tarda segundos en la primera jugada
+#import tictactoev2 as ttt
+
+# Busqueda que usa la IA, si el modulo la ofrece en ALGORITHMS ("minimax" o
+# "alphabeta"); si no, su minimax(). En tictactoe.py y tictactoev3.py las dos
+# consultan primero el libro de aperturas (openingbook.txt): cada jugada de
+# una partida normal es una sola busqueda en un diccionario
+ALGORITHM = "alphabeta"
+search = getattr(ttt, "ALGORITHMS", {}).get(ALGORITHM, ttt.minimax)
 
 pygame.init()
 size = width, height = 600, 400
@@ -42,15 +55,37 @@ mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
 moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
 
+# Fotogramas por segundo como maximo
+FPS = 30
+clock = pygame.time.Clock()
+
+
+def think(board, answer):
+    """
+    Computes the AI move for board and appends it to answer, or appends
+    the exception raised by the search so the main loop can re-raise it.
+    """
+    try:
+        answer.append(search(board))
+    except Exception as error:
+        answer.append(error)
+
+
 user = None
 board = ttt.initial_state()
-ai_turn = False
+# Jugada de la IA en curso: el hilo que la calcula y la lista donde la deja
+ai_thread = None
+ai_answer = []
 
 while True:
 
+    # Cada clic se atiende una sola vez, en el fotograma en que ocurre
+    mouse = None
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             sys.exit()
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            mouse = event.pos
 
     screen.fill(black)
 
@@ -79,14 +114,10 @@ while True:
         screen.blit(playO, playORect)
 
         # Check if button is clicked
-        click, _, _ = pygame.mouse.get_pressed()
-        if click == 1:
-            mouse = pygame.mouse.get_pos()
+        if mouse is not None:
             if playXButton.collidepoint(mouse):
-                time.sleep(0.2)
                 user = ttt.X
             elif playOButton.collidepoint(mouse):
-                time.sleep(0.2)
                 user = ttt.O
 
     else:
@@ -133,20 +164,22 @@ while True:
         titleRect.center = ((width / 2), 30)
         screen.blit(title, titleRect)
 
-        # Check for AI move
+        # Check for AI move: se lanza en segundo plano y se recoge cuando acaba
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
+            if ai_thread is None:
+                ai_answer = []
+                ai_thread = threading.Thread(target=think, daemon=True,
+                                             args=([row[:] for row in board], ai_answer))
+                ai_thread.start()
+            elif ai_answer:
+                ai_thread = None
+                # Un fallo de la busqueda se relanza aqui en lugar de perderse en el hilo
+                if isinstance(ai_answer[0], Exception):
+                    raise ai_answer[0]
+                board = ttt.result(board, ai_answer[0])
 
         # Check for a user move
-        click, _, _ = pygame.mouse.get_pressed()
-        if click == 1 and user == player and not game_over:
-            mouse = pygame.mouse.get_pos()
+        if mouse is not None and user == player and not game_over:
             for i in range(3):
                 for j in range(3):
                     if (board[i][j] == ttt.EMPTY and tiles[i][j].collidepoint(mouse)):
@@ -159,13 +192,9 @@ while True:
             againRect.center = againButton.center
             pygame.draw.rect(screen, white, againButton)
             screen.blit(again, againRect)
-            click, _, _ = pygame.mouse.get_pressed()
-            if click == 1:
-                mouse = pygame.mouse.get_pos()
-                if againButton.collidepoint(mouse):
-                    time.sleep(0.2)
-                    user = None
-                    board = ttt.initial_state()
-                    ai_turn = False
+            if mouse is not None and againButton.collidepoint(mouse):
+                user = None
+                board = ttt.initial_state()
 
     pygame.display.flip()
+    clock.tick(FPS)
@@ -3,11 +3,19 @@ Tic Tac Toe Player
 """
 
 import math
+import sys
+
+import tictactoesearch as search
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# Motor, tabla y libro que usa tictactoesearch (ver su cabecera)
+engine = sys.modules[__name__]
+transpositions = {}
+book = None
+
 def initial_state():
     """
     Returns starting state of the board.
@@ -75,28 +83,37 @@ def utility(board):
     else:
         return 0
 
+def value(board):
+    """
+    Returns the minimax value of the board, memoized in the
+    transposition table.
+    """
+    return search.value(engine, board)
+
 def minimax(board):
     """
     Returns the optimal action for the current player on the board.
     """
-    def max_value(board):
-        if terminal(board):
-            return utility(board)
-        v = float('-inf')
-        for action in actions(board):
-            v = max(v, min_value(result(board, action)))
-        return v
-
-    def min_value(board):
-        if terminal(board):
-            return utility(board)
-        v = float('inf')
-        for action in actions(board):
-            v = min(v, max_value(result(board, action)))
-        return v
+    # Primero el libro de aperturas
+    move = search.book_move(engine, board)
+    if move is not None:
+        return move
 
     current_player = player(board)
     if current_player == X:
-        return max(actions(board), key=lambda a: min_value(result(board, a)))
+        return max(actions(board), key=lambda a: value(result(board, a)))
     else:
-        return min(actions(board), key=lambda a: max_value(result(board, a)))
\ No newline at end of file
+        return min(actions(board), key=lambda a: value(result(board, a)))
+
+def alphabeta(board):
+    """
+    Returns the same action as minimax, searching with alpha-beta
+    pruning and win-first, center-first move ordering.
+    """
+    return search.alphabeta(engine, board)
+
+# Busquedas por nombre (ver la cabecera de tictactoesearch)
+ALGORITHMS = {
+    "minimax": minimax,
+    "alphabeta": alphabeta,
+}
@@ -0,0 +1,188 @@
+# File: tictactoesearch.py
+# Description: Piezas de busqueda comunes a tictactoe.py y tictactoev3.py.
+#
+# Canonizacion de tableros por simetria, minimax memorizado en una tabla de
+# transposiciones, lectura del libro de aperturas y busqueda alpha-beta con
+# ordenacion de jugadas. Cada funcion recibe el motor (el modulo) como primer
+# argumento y usa sus player(), actions(), result(), terminal() y utility(),
+# asi como sus variables transpositions y book: cada motor conserva su propia
+# tabla y su propio libro.
+#
+# Cada motor que usa este modulo define a nivel de modulo:
+#
+#   engine = sys.modules[__name__]  el propio modulo, que pasa como motor
+#   transpositions = {}             tablero canonico -> valor minimax; vive en
+#                                   el modulo, asi que se conserva entre
+#                                   jugadas durante una sesion de runner.py
+#   book = None                     libro de aperturas (tablero -> (jugada,
+#                                   valor)), cargado en la primera consulta
+#
+# Su minimax() pregunta primero al libro con book_move(): cualquier posicion
+# alcanzable es una sola consulta. Su diccionario ALGORITHMS da las busquedas
+# por nombre ("minimax", "alphabeta", ...) a runner.py y tournament.py; todas
+# devuelven la misma jugada.
+#
+# Requirements: Python 3.9 o superior
+# Dependencies: math, os
+#
+# El resto del código va debajo de aquí ---------------------------------------
+
+import math
+import os
+
+# Las 8 simetrias del tablero (4 giros y sus reflejos) como permutaciones de
+# las casillas 0..8 leidas por filas: la casilla k de la imagen es la p[k]
+SYMMETRIES = [
+    (0, 1, 2, 3, 4, 5, 6, 7, 8),
+    (6, 3, 0, 7, 4, 1, 8, 5, 2),
+    (8, 7, 6, 5, 4, 3, 2, 1, 0),
+    (2, 5, 8, 1, 4, 7, 0, 3, 6),
+    (2, 1, 0, 5, 4, 3, 8, 7, 6),
+    (0, 3, 6, 1, 4, 7, 2, 5, 8),
+    (6, 7, 8, 3, 4, 5, 0, 1, 2),
+    (8, 5, 2, 7, 4, 1, 6, 3, 0),
+]
+
+# Orden en que alpha-beta prueba las casillas: centro, esquinas y lados
+PREFERENCE = [(1, 1), (0, 0), (0, 2), (2, 0), (2, 2), (0, 1), (1, 0), (1, 2), (2, 1)]
+
+# Libro de aperturas generado por openingbook.py
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "openingbook.txt")
+
+
+def board_key(board):
+    """
+    Returns the board as a hashable 9-character string read by rows.
+    """
+    return "".join("." if cell is None else cell for row in board for cell in row)
+
+
+def canonical_key(board):
+    """
+    Returns the smallest key among the 8 symmetries of the board, so
+    that equivalent positions share one transposition table entry.
+    """
+    key = board_key(board)
+    return min("".join(key[k] for k in symmetry) for symmetry in SYMMETRIES)
+
+
+def value(game, board):
+    """
+    Returns the minimax value of the board, memoized in the engine's
+    transposition table.
+    """
+    key = canonical_key(board)
+    if key in game.transpositions:
+        return game.transpositions[key]
+
+    # Los hijos pasan por game.value() para que el motor pueda contar nodos
+    if game.terminal(board):
+        v = game.utility(board)
+    elif game.player(board) == game.X:
+        v = max(game.value(game.result(board, action)) for action in game.actions(board))
+    else:
+        v = min(game.value(game.result(board, action)) for action in game.actions(board))
+
+    game.transpositions[key] = v
+    return v
+
+
+def read_book(path=BOOK_FILE):
+    """
+    Returns the opening book read from path as a dict of board keys to
+    (action, value), or an empty dict if there is no book file.
+    """
+    book = {}
+    if not os.path.exists(path):
+        return book
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            key, move, move_value = line.split()
+            book[key] = ((int(move) // 3, int(move) % 3), int(move_value))
+    return book
+
+
+def book_move(game, board):
+    """
+    Returns the engine's opening book move for the board, or None if
+    the board is not in the book. Loads the book on first use.
+    """
+    if game.book is None:
+        game.book = read_book()
+    entry = game.book.get(board_key(board))
+    return None if entry is None else entry[0]
+
+
+def ordered_actions(game, board):
+    """
+    Returns the available actions with the moves that win on the spot
+    first, then the center, the corners and the edges.
+    """
+    current_player = game.player(board)
+    moves = [(i, j) for i, j in PREFERENCE if board[i][j] is None]
+    wins = [action for action in moves
+            if game.winner(game.result(board, action)) == current_player]
+    return wins + [action for action in moves if action not in wins]
+
+
+def alphabeta(game, board):
+    """
+    Returns the same action as the engine's minimax search, searching
+    with alpha-beta pruning and win-first, center-first move ordering.
+    """
+    if game.terminal(board):
+        return None
+
+    # Como en minimax, el libro responde antes de buscar
+    move = book_move(game, board)
+    if move is not None:
+        return move
+
+    def max_value(board, alpha, beta):
+        if game.terminal(board):
+            return game.utility(board)
+        v = -math.inf
+        for action in ordered_actions(game, board):
+            v = max(v, min_value(game.result(board, action), alpha, beta))
+            if v >= beta:
+                return v
+            alpha = max(alpha, v)
+        return v
+
+    def min_value(board, alpha, beta):
+        if game.terminal(board):
+            return game.utility(board)
+        v = math.inf
+        for action in ordered_actions(game, board):
+            v = min(v, max_value(game.result(board, action), alpha, beta))
+            if v <= alpha:
+                return v
+            beta = min(beta, v)
+        return v
+
+    # La raiz recorre las acciones en el mismo orden que minimax y solo cambia
+    # de jugada con un valor estrictamente mejor, asi que el desempate es el
+    # mismo. Cada hijo se busca con la ventana (mejor valor, victoria): un
+    # valor dentro de ella es exacto y llegar a la victoria corta la busqueda
+    current_player = game.player(board)
+    best_action = None
+    if current_player == game.X:
+        best_value = -math.inf
+        for action in game.actions(board):
+            action_value = min_value(game.result(board, action), best_value, 1)
+            if action_value > best_value:
+                best_value = action_value
+                best_action = action
+                if best_value == 1:
+                    break
+    else:
+        best_value = math.inf
+        for action in game.actions(board):
+            action_value = max_value(game.result(board, action), -1, best_value)
+            if action_value < best_value:
+                best_value = action_value
+                best_action = action
+                if best_value == -1:
+                    break
+
+    return best_action
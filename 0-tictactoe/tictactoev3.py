@@ -1,9 +1,23 @@
 import math
+import multiprocessing
+import os
+import sys
+
+import tictactoesearch as search
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# Motor, tabla y libro que usa tictactoesearch (ver su cabecera)
+engine = sys.modules[__name__]
+transpositions = {}
+book = None
+
+# Nodos visitados por value() y, tras parallel_minimax(), nodos de cada proceso
+nodes = 0
+worker_nodes = {}
+
 def initial_state():
     """
     Returns starting state of the board.
@@ -80,45 +94,106 @@ def utility(board):
     else:
         return 0
 
+def value(board):
+    """
+    Returns the minimax value of the board, memoized in the
+    transposition table.
+    """
+    global nodes
+    nodes += 1
+    return search.value(engine, board)
+
 def minimax(board):
     """
     Returns the optimal action for the current player on the board.
     """
+    # Primero el libro de aperturas
+    move = search.book_move(engine, board)
+    if move is not None:
+        return move
+
     if terminal(board):
         return None
 
     current_player = player(board)
 
-    def max_value(board):
-        if terminal(board):
-            return utility(board)
-        v = -math.inf
-        for action in actions(board):
-            v = max(v, min_value(result(board, action)))
-        return v
-
-    def min_value(board):
-        if terminal(board):
-            return utility(board)
-        v = math.inf
-        for action in actions(board):
-            v = min(v, max_value(result(board, action)))
-        return v
-
     best_action = None
     if current_player == X:
         best_value = -math.inf
         for action in actions(board):
-            action_value = min_value(result(board, action))
+            action_value = value(result(board, action))
             if action_value > best_value:
                 best_value = action_value
                 best_action = action
     else:
         best_value = math.inf
         for action in actions(board):
-            action_value = max_value(result(board, action))
+            action_value = value(result(board, action))
             if action_value < best_value:
                 best_value = action_value
                 best_action = action
 
     return best_action
+
+def alphabeta(board):
+    """
+    Returns the same action as minimax, searching with alpha-beta
+    pruning and win-first, center-first move ordering.
+    """
+    return search.alphabeta(engine, board)
+
+def root_worker(board):
+    """
+    Returns the value of one root child together with the worker's pid,
+    the nodes it visited and the transposition entries it added.
+    """
+    global nodes
+    nodes = 0
+    # El diccionario conserva el orden de insercion: lo nuevo va al final
+    start = len(transpositions)
+    child_value = value(board)
+    return child_value, os.getpid(), nodes, list(transpositions.items())[start:]
+
+def parallel_minimax(board, processes=None):
+    """
+    Returns the same action as minimax, evaluating the root children in
+    a pool of worker processes and merging their transposition tables.
+    """
+    global nodes
+    # Como minimax, primero el libro: asi devuelve su misma jugada
+    move = search.book_move(engine, board)
+    if move is not None:
+        return move
+
+    if terminal(board):
+        return None
+
+    # Cada hijo de la raiz va a un proceso; las entradas nuevas de cada
+    # trabajador se fusionan despues en la tabla del proceso principal
+    root_actions = list(actions(board))
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.map(root_worker, [result(board, action) for action in root_actions])
+
+    worker_nodes.clear()
+    for _, pid, count, entries in results:
+        worker_nodes[pid] = worker_nodes.get(pid, 0) + count
+        nodes += count
+        transpositions.update(entries)
+
+    # Mismo desempate que minimax: la primera accion con el mejor valor
+    current_player = player(board)
+    best_action = None
+    best_value = -math.inf if current_player == X else math.inf
+    for action, (action_value, _, _, _) in zip(root_actions, results):
+        if (action_value > best_value if current_player == X else action_value < best_value):
+            best_value = action_value
+            best_action = action
+
+    return best_action
+
+# Busquedas por nombre (ver la cabecera de tictactoesearch)
+ALGORITHMS = {
+    "minimax": minimax,
+    "alphabeta": alphabeta,
+    "parallel": parallel_minimax,
+}
@@ -0,0 +1,186 @@
+# File: tictactoev4.py
+# Description: Motor del Tres en raya sobre bitboards.
+#
+# Cada tablero son dos enteros de 9 bits, uno con las casillas de X y otro
+# con las de O (la casilla (i, j) es el bit 3 * i + j). Las victorias se
+# comprueban con una tabla precalculada de las 512 combinaciones, y la
+# busqueda (negamax con poda alpha-beta) solo trabaja con esos enteros: no
+# copia tableros ni cuenta fichas en cada nodo.
+#
+# Las funciones initial_state(), player(), actions(), result(), winner(),
+# terminal(), utility() y minimax() mantienen la API de listas de listas de
+# tictactoe.py para que runner.py pueda usarlo tal cual.
+#
+# Requirements: Python 3.9 o superior
+# Dependencies: math
+#
+# Ejecucion: $ python3 runner.py   (importando tictactoev4 as ttt)
+#
+# El resto del código va debajo de aquí ---------------------------------------
+
+import math
+
+X = "X"
+O = "O"
+EMPTY = None
+
+FULL = 0b111111111
+
+# Las 8 lineas ganadoras como mascaras de bits
+LINES = [
+    0b000000111, 0b000111000, 0b111000000,  # filas
+    0b001001001, 0b010010010, 0b100100100,  # columnas
+    0b100010001, 0b001010100,               # diagonales
+]
+
+# WINS[bits] es True si esas casillas contienen alguna linea completa
+WINS = [any(bits & line == line for line in LINES) for bits in range(FULL + 1)]
+
+# Numero de fichas de cada combinacion de casillas
+COUNTS = [bin(bits).count("1") for bits in range(FULL + 1)]
+
+# Casillas como bits, en el orden en que se prueban: centro, esquinas y lados
+ORDER = [1 << k for k in (4, 0, 2, 6, 8, 1, 3, 5, 7)]
+
+
+def encode(board):
+    """
+    Returns the (x, o) bitboards of a list-of-lists board.
+    """
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == X:
+                x |= 1 << (3 * i + j)
+            elif board[i][j] == O:
+                o |= 1 << (3 * i + j)
+    return x, o
+
+
+def decode(x, o):
+    """
+    Returns the list-of-lists board of the (x, o) bitboards.
+    """
+    return [[X if x >> (3 * i + j) & 1 else O if o >> (3 * i + j) & 1 else EMPTY
+             for j in range(3)]
+            for i in range(3)]
+
+
+def negamax(me, them, alpha, beta):
+    """
+    Returns the value of the position for the player to move, whose
+    pieces are me, after the opponent (them) has just moved.
+    """
+    if WINS[them]:
+        return -1
+    free = FULL & ~(me | them)
+    if not free:
+        return 0
+
+    # Una jugada que gana en el acto no necesita mas busqueda
+    for bit in ORDER:
+        if free & bit and WINS[me | bit]:
+            return 1
+
+    v = -math.inf
+    for bit in ORDER:
+        if free & bit:
+            v = max(v, -negamax(them, me | bit, -beta, -alpha))
+            if v >= beta:
+                return v
+            alpha = max(alpha, v)
+    return v
+
+
+def initial_state():
+    """
+    Returns starting state of the board.
+    """
+    return [[EMPTY, EMPTY, EMPTY],
+            [EMPTY, EMPTY, EMPTY],
+            [EMPTY, EMPTY, EMPTY]]
+
+
+def player(board):
+    """
+    Returns player who has the next turn on a board.
+    """
+    x, o = encode(board)
+    return O if COUNTS[x] > COUNTS[o] else X
+
+
+def actions(board):
+    """
+    Returns set of all possible actions (i, j) available on the board.
+    """
+    x, o = encode(board)
+    return {(k // 3, k % 3) for k in range(9) if not (x | o) >> k & 1}
+
+
+def result(board, action):
+    """
+    Returns the board that results from making move (i, j) on the board.
+    """
+    x, o = encode(board)
+    bit = 1 << (3 * action[0] + action[1])
+    if (x | o) & bit:
+        raise ValueError("Invalid action")
+    if COUNTS[x] > COUNTS[o]:
+        return decode(x, o | bit)
+    return decode(x | bit, o)
+
+
+def winner(board):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    x, o = encode(board)
+    if WINS[x]:
+        return X
+    if WINS[o]:
+        return O
+    return None
+
+
+def terminal(board):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    x, o = encode(board)
+    return WINS[x] or WINS[o] or x | o == FULL
+
+
+def utility(board):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    x, o = encode(board)
+    if WINS[x]:
+        return 1
+    if WINS[o]:
+        return -1
+    return 0
+
+
+def minimax(board):
+    """
+    Returns the optimal action for the current player on the board.
+    """
+    x, o = encode(board)
+    if WINS[x] or WINS[o] or x | o == FULL:
+        return None
+    me, them = (o, x) if COUNTS[x] > COUNTS[o] else (x, o)
+
+    # La raiz recorre las acciones en el mismo orden que tictactoe.py y solo
+    # cambia de jugada con un valor estrictamente mejor: misma jugada elegida
+    best_value = -math.inf
+    best_action = None
+    for action in actions(board):
+        bit = 1 << (3 * action[0] + action[1])
+        action_value = -negamax(them, me | bit, -1, -best_value)
+        if action_value > best_value:
+            best_value = action_value
+            best_action = action
+            if best_value == 1:
+                break
+    return best_action
@@ -0,0 +1,211 @@
+# File: tournament.py
+# Description: Torneo sin interfaz grafica entre los motores del Tres en raya.
+#
+# Enfrenta cada motor (tictactoe.py, tictactoev2.py, tictactoev3.py,
+# tictactoev4.py y un jugador al azar) contra todos los demas, con X y con O,
+# durante N partidas por emparejamiento, opcionalmente repartidas en varios
+# procesos. Al final muestra la tabla de resultados y, por motor, nodos
+# visitados, nodos por segundo y percentiles de latencia por jugada.
+#
+# Los nodos se cuentan envolviendo la funcion que la busqueda llama en cada
+# nodo (result() o, en el motor de bitboards, negamax()). Con --no-book los
+# motores con libro de aperturas buscan de verdad en lugar de consultarlo.
+#
+# Requirements: Python 3.9 o superior
+# Dependencies: argparse, multiprocessing, tictactoe.py, tictactoev2.py,
+#               tictactoev3.py y tictactoev4.py
+#
+# Ejecucion: $ python3 tournament.py --games 10 --engine tictactoev3 --engine random
+#            $ python3 tournament.py --games 50 --processes 4 --no-book --json torneo.json
+#
+# El resto del código va debajo de aquí ---------------------------------------
+
+import argparse
+import importlib
+import itertools
+import json
+import multiprocessing
+import random
+import time
+
+# Arbitro: sus reglas no pasan por la funcion que se cuenta en cada motor
+import tictactoev4 as referee
+
+ENGINES = ["tictactoe", "tictactoev2", "tictactoev3", "tictactoev4", "random"]
+
+# Funcion que la busqueda de cada motor llama una vez por nodo
+COUNTED = {"tictactoev4": "negamax"}
+
+# Nodos contados por motor en este proceso
+counters = {}
+
+
+def instrument(name):
+    """
+    Returns the engine module, wrapping once per process the function
+    its search calls for every node so that the calls are counted.
+    """
+    module = importlib.import_module(name)
+    if name not in counters:
+        counters[name] = 0
+        attribute = COUNTED.get(name, "result")
+        original = getattr(module, attribute)
+
+        def counted(*args):
+            counters[name] += 1
+            return original(*args)
+
+        setattr(module, attribute, counted)
+    return module
+
+
+def choose_move(name, board, rng, algorithm, book):
+    """
+    Returns the engine's move on the board and the nodes it visited.
+    """
+    if name == "random":
+        return rng.choice(sorted(referee.actions(board))), 0
+
+    module = instrument(name)
+    if not book and hasattr(module, "book"):
+        module.book = {}
+    search = getattr(module, "ALGORITHMS", {}).get(algorithm, module.minimax)
+    before = counters[name]
+    move = search(board)
+    return move, counters[name] - before
+
+
+def play_game(task):
+    """
+    Plays one game and returns its result with one record per move.
+    """
+    x_engine, o_engine, seed, algorithm, book = task
+    rng = random.Random(seed)
+    board = referee.initial_state()
+    moves = []
+    while not referee.terminal(board):
+        name = x_engine if referee.player(board) == referee.X else o_engine
+        start = time.perf_counter()
+        move, nodes = choose_move(name, board, rng, algorithm, book)
+        moves.append((name, time.perf_counter() - start, nodes))
+        board = referee.result(board, move)
+    return x_engine, o_engine, referee.utility(board), moves
+
+
+def percentile(values, fraction):
+    """
+    Returns the fraction percentile of sorted values, or None.
+    """
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_tournament(engines, games, processes=1, algorithm="minimax", book=True, seed=0):
+    """
+    Plays games games for every ordered pair of distinct engines and
+    returns the results table and the per-engine statistics.
+    """
+    tasks = [(x_engine, o_engine, seed + n, algorithm, book)
+             for x_engine, o_engine in itertools.permutations(engines, 2)
+             for n in range(games)]
+    if processes > 1:
+        with multiprocessing.Pool(processes) as pool:
+            played = pool.map(play_game, tasks)
+    else:
+        played = [play_game(task) for task in tasks]
+
+    table = {}
+    samples = {name: {"latencies": [], "nodes": 0} for name in engines}
+    for x_engine, o_engine, score, moves in played:
+        row = table.setdefault(f"{x_engine} vs {o_engine}", {"X": 0, "O": 0, "tie": 0})
+        row["X" if score == 1 else "O" if score == -1 else "tie"] += 1
+        for name, seconds, nodes in moves:
+            samples[name]["latencies"].append(seconds * 1000)
+            samples[name]["nodes"] += nodes
+
+    stats = []
+    for name in engines:
+        latencies = sorted(samples[name]["latencies"])
+        seconds = sum(latencies) / 1000
+        stats.append({
+            "engine": name,
+            "moves": len(latencies),
+            "nodes": samples[name]["nodes"],
+            "nodes_per_sec": samples[name]["nodes"] / seconds if seconds else None,
+            "mean_ms": sum(latencies) / len(latencies) if latencies else None,
+            "p50_ms": percentile(latencies, 0.50),
+            "p95_ms": percentile(latencies, 0.95),
+            "p99_ms": percentile(latencies, 0.99),
+            "max_ms": latencies[-1] if latencies else None,
+        })
+    return table, stats
+
+
+def print_rows(rows):
+    """
+    Prints rows of strings as right-aligned columns.
+    """
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play the tic-tac-toe engines against each other without a window.")
+    parser.add_argument("-e", "--engine", action="append", choices=ENGINES,
+                        help="engine to include (can be repeated; default: all)")
+    parser.add_argument("--games", type=int, default=4,
+                        help="games per ordered pair of engines (default: 4)")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="worker processes playing games (default: 1)")
+    parser.add_argument("--algorithm", default="minimax", choices=["minimax", "alphabeta"],
+                        help="search of the engines that offer both (default: minimax)")
+    parser.add_argument("--no-book", action="store_true",
+                        help="search instead of using the opening book")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument("--json", metavar="FILE", help="also write the results as JSON to FILE")
+    args = parser.parse_args()
+
+    engines = args.engine or ENGINES
+    start = time.perf_counter()
+    table, stats = run_tournament(engines, args.games, args.processes, args.algorithm,
+                                  not args.no_book, args.seed)
+    print(f"{len(engines)} engines, {args.games} games per pairing, "
+          f"{time.perf_counter() - start:.3f}s")
+
+    rows = [["X vs O", "X wins", "O wins", "ties"]]
+    for pairing, row in table.items():
+        rows.append([pairing, str(row["X"]), str(row["O"]), str(row["tie"])])
+    print_rows(rows)
+    print()
+
+    columns = [
+        ("engine", "{}"), ("moves", "{}"), ("nodes", "{}"), ("nodes_per_sec", "{:.0f}"),
+        ("mean_ms", "{:.3f}"), ("p50_ms", "{:.3f}"), ("p95_ms", "{:.3f}"),
+        ("p99_ms", "{:.3f}"), ("max_ms", "{:.3f}"),
+    ]
+    rows = [[column for column, _ in columns]]
+    for result in stats:
+        rows.append([
+            "-" if result[column] is None else style.format(result[column])
+            for column, style in columns
+        ])
+    print_rows(rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "engines": engines,
+                "games": args.games,
+                "algorithm": args.algorithm,
+                "book": not args.no_book,
+                "seed": args.seed,
+                "results": table,
+                "engines_stats": stats,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import heapq
 import itertools
 
 class Sentence():
@@ -253,3 +254,403 @@ def model_check(knowledge, query):
 
     # Check that knowledge entails query
     return check_all(knowledge, query, symbols, dict())
+
+
+class CNF():
+    """Clauses of integer literals built from sentences by Tseitin encoding."""
+
+    def __init__(self):
+        self.variables = {}
+        self.num_variables = 0
+        self.clauses = []
+
+    def new_variable(self):
+        """Returns a fresh variable number."""
+        self.num_variables += 1
+        return self.num_variables
+
+    def encode(self, sentence):
+        """Returns the literal equivalent to a sentence, adding its clauses."""
+
+        # Cada subformula con conectiva recibe una variable nueva equivalente
+        # a ella; las subformulas repetidas (el mismo objeto) se codifican una vez
+        literals = {}
+
+        def encode(sentence):
+            key = id(sentence)
+            if key in literals:
+                return literals[key]
+            if isinstance(sentence, Symbol):
+                if sentence.name not in self.variables:
+                    self.variables[sentence.name] = self.new_variable()
+                literal = self.variables[sentence.name]
+            elif isinstance(sentence, Not):
+                literal = -encode(sentence.operand)
+            elif isinstance(sentence, And):
+                parts = [encode(conjunct) for conjunct in sentence.conjuncts]
+                literal = self.new_variable()
+                self.clauses.extend([-literal, part] for part in parts)
+                self.clauses.append([literal] + [-part for part in parts])
+            elif isinstance(sentence, Or):
+                parts = [encode(disjunct) for disjunct in sentence.disjuncts]
+                literal = self.new_variable()
+                self.clauses.extend([literal, -part] for part in parts)
+                self.clauses.append([-literal] + parts)
+            elif isinstance(sentence, Implication):
+                a, b = encode(sentence.antecedent), encode(sentence.consequent)
+                literal = self.new_variable()
+                self.clauses.extend([[-literal, -a, b], [literal, a], [literal, -b]])
+            elif isinstance(sentence, Biconditional):
+                a, b = encode(sentence.left), encode(sentence.right)
+                literal = self.new_variable()
+                self.clauses.extend([[-literal, -a, b], [-literal, a, -b],
+                                     [literal, a, b], [literal, -a, -b]])
+            else:
+                raise TypeError("must be a logical sentence")
+            literals[key] = literal
+            return literal
+
+        return encode(sentence)
+
+    def add(self, sentence):
+        """Adds a sentence that must be true."""
+        self.clauses.append([self.encode(sentence)])
+
+class Solver():
+    """CDCL SAT solver over clauses of non-zero integer literals."""
+
+    def __init__(self, clauses, num_variables):
+        self.num_variables = num_variables
+        self.values = [None] * (num_variables + 1)
+        self.levels = [0] * (num_variables + 1)
+        self.reasons = [None] * (num_variables + 1)
+        self.phases = [False] * (num_variables + 1)
+        self.activity = [0.0] * (num_variables + 1)
+        self.bump = 1.0
+        self.heap = [(0.0, variable) for variable in range(1, num_variables + 1)]
+        self.trail = []
+        self.trail_limits = []
+        self.queue_head = 0
+        self.watches = {}
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.unsatisfiable = False
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def value(self, literal):
+        """Returns the truth value of a literal, or None if unassigned."""
+        value = self.values[abs(literal)]
+        if value is None:
+            return None
+        return value if literal > 0 else not value
+
+    def add_clause(self, literals):
+        """Adds an input clause before solving."""
+        clause = []
+        for literal in literals:
+            if -literal in clause:
+                return
+            if literal not in clause:
+                clause.append(literal)
+        if not clause:
+            self.unsatisfiable = True
+        elif len(clause) == 1:
+            if self.value(clause[0]) is False:
+                self.unsatisfiable = True
+            elif self.value(clause[0]) is None:
+                self.assign(clause[0], None)
+        else:
+            self.watch(clause)
+
+    def watch(self, clause):
+        """Watches the first two literals of a clause."""
+        self.watches.setdefault(clause[0], []).append(clause)
+        self.watches.setdefault(clause[1], []).append(clause)
+
+    def assign(self, literal, reason):
+        """Makes a literal true at the current decision level."""
+        variable = abs(literal)
+        self.values[variable] = literal > 0
+        self.levels[variable] = len(self.trail_limits)
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """Returns a conflicting clause after unit propagation, or None."""
+        while self.queue_head < len(self.trail):
+            false_literal = -self.trail[self.queue_head]
+            self.queue_head += 1
+            self.propagations += 1
+            watching = self.watches.get(false_literal, [])
+            kept = []
+            for position, clause in enumerate(watching):
+                # El literal falso pasa a la posicion 1
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self.value(clause[0]) is True:
+                    kept.append(clause)
+                    continue
+                # Buscar otro literal no falso que vigilar
+                for k in range(2, len(clause)):
+                    if self.value(clause[k]) is not False:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches.setdefault(clause[1], []).append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if self.value(clause[0]) is False:
+                        kept.extend(watching[position + 1:])
+                        self.watches[false_literal] = kept
+                        return clause
+                    self.assign(clause[0], clause)
+            self.watches[false_literal] = kept
+        return None
+
+    def analyze(self, conflict):
+        """Returns the first-UIP learnt clause and the level to go back to."""
+        level = len(self.trail_limits)
+        seen = set()
+        learnt = [None]
+        pending = 0
+        literal = None
+        index = len(self.trail) - 1
+        clause = conflict
+        while True:
+            for other in (clause if literal is None else clause[1:]):
+                variable = abs(other)
+                if variable not in seen and self.levels[variable] > 0:
+                    seen.add(variable)
+                    self.bump_activity(variable)
+                    if self.levels[variable] == level:
+                        pending += 1
+                    else:
+                        learnt.append(other)
+            # Siguiente literal del rastro que interviene en el conflicto
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            pending -= 1
+            if not pending:
+                break
+            clause = self.reasons[abs(literal)]
+        learnt[0] = -literal
+
+        if len(learnt) == 1:
+            return learnt, 0
+        # El literal del nivel mas alto despues del UIP se vigila en segundo lugar
+        deepest = max(range(1, len(learnt)), key=lambda k: self.levels[abs(learnt[k])])
+        learnt[1], learnt[deepest] = learnt[deepest], learnt[1]
+        return learnt, self.levels[abs(learnt[1])]
+
+    def bump_activity(self, variable):
+        """Raises the decision priority of a variable seen in a conflict."""
+        self.activity[variable] += self.bump
+        if self.activity[variable] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.bump *= 1e-100
+            self.heap = [(-self.activity[v], v) for v in range(1, self.num_variables + 1)]
+            heapq.heapify(self.heap)
+        else:
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+
+    def backtrack(self, level):
+        """Undoes every assignment above a decision level."""
+        if len(self.trail_limits) <= level:
+            return
+        start = self.trail_limits[level]
+        for literal in self.trail[start:]:
+            variable = abs(literal)
+            self.phases[variable] = literal > 0
+            self.values[variable] = None
+            self.reasons[variable] = None
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+        del self.trail[start:]
+        del self.trail_limits[level:]
+        self.queue_head = start
+
+    def decide(self):
+        """Returns the unassigned variable of highest activity, or None."""
+        while self.heap:
+            _, variable = heapq.heappop(self.heap)
+            if self.values[variable] is None:
+                return variable
+        return None
+
+    def solve(self):
+        """Returns True if the clauses are satisfiable."""
+        if self.unsatisfiable:
+            return False
+        restart_limit = 100
+        conflicts_since_restart = 0
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                conflicts_since_restart += 1
+                if not self.trail_limits:
+                    self.unsatisfiable = True
+                    return False
+                learnt, level = self.analyze(conflict)
+                self.backtrack(level)
+                if len(learnt) == 1:
+                    self.assign(learnt[0], None)
+                else:
+                    self.watch(learnt)
+                    self.assign(learnt[0], learnt)
+                self.bump /= 0.95
+            elif conflicts_since_restart >= restart_limit:
+                # Reinicio: se conservan las clausulas aprendidas
+                conflicts_since_restart = 0
+                restart_limit = int(restart_limit * 1.5)
+                self.backtrack(0)
+            else:
+                variable = self.decide()
+                if variable is None:
+                    return True
+                self.decisions += 1
+                self.trail_limits.append(len(self.trail))
+                self.assign(variable if self.phases[variable] else -variable, None)
+
+def model_check_cdcl(knowledge, query):
+    """Checks if knowledge base entails query with a CDCL SAT solver."""
+
+    # La base entraña la consulta si y solo si knowledge ∧ ¬query es insatisfacible
+    cnf = CNF()
+    cnf.add(knowledge)
+    cnf.add(Not(query))
+    return not Solver(cnf.clauses, cnf.num_variables).solve()
+
+# Profundidad maxima de anidamiento de una expresion compilada: las
+# subexpresiones mas hondas se guardan antes en variables temporales
+COMPILE_DEPTH = 40
+
+def sentence_code(sentence, slots, statements):
+    """Returns a Python expression for a sentence over slot variables."""
+
+    # Cada simbolo es la variable local s<slot>; lo que pasa de
+    # COMPILE_DEPTH niveles se calcula antes en una temporal t<k>
+    def code(sentence):
+        if isinstance(sentence, Symbol):
+            return f"s{slots[sentence.name]}", 0
+        if isinstance(sentence, Not):
+            text, depth = code(sentence.operand)
+            text, depth = f"(not {text})", depth + 1
+        elif isinstance(sentence, (And, Or)):
+            parts = [code(part) for part in (
+                sentence.conjuncts if isinstance(sentence, And) else sentence.disjuncts)]
+            if not parts:
+                return ("True" if isinstance(sentence, And) else "False"), 0
+            joiner = " and " if isinstance(sentence, And) else " or "
+            text = "(" + joiner.join(text for text, _ in parts) + ")"
+            depth = max(depth for _, depth in parts) + 1
+        elif isinstance(sentence, Implication):
+            (a, a_depth), (b, b_depth) = code(sentence.antecedent), code(sentence.consequent)
+            text, depth = f"(not {a} or {b})", max(a_depth, b_depth) + 1
+        elif isinstance(sentence, Biconditional):
+            # Cada lado se evalua una sola vez
+            (a, a_depth), (b, b_depth) = code(sentence.left), code(sentence.right)
+            text, depth = f"(bool({a}) == bool({b}))", max(a_depth, b_depth) + 1
+        else:
+            raise TypeError("must be a logical sentence")
+        if depth < COMPILE_DEPTH:
+            return text, depth
+        temporary = f"t{len(statements)}"
+        statements.append(f"{temporary} = {text}")
+        return temporary, 0
+
+    return code(sentence)[0]
+
+def compile_sentence(sentence, slots):
+    """Returns a function evaluating a sentence on truth values indexed by slot."""
+    statements = []
+    expression = sentence_code(sentence, slots, statements)
+    lines = ["def evaluate(values):"]
+    lines.extend(f"    s{slot} = values[{slot}]" for slot in sorted(set(slots.values())))
+    lines.extend(f"    {statement}" for statement in statements)
+    lines.append(f"    return bool({expression})")
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["evaluate"]
+
+def model_check_compiled(knowledge, query):
+    """Checks if knowledge base entails query over models of compiled code."""
+
+    # Una sola funcion generada recorre todos los modelos con los simbolos
+    # como variables locales y comprueba knowledge => query en cada uno
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    slots = {symbol: slot for slot, symbol in enumerate(symbols)}
+    statements = []
+    knowledge_code = sentence_code(knowledge, slots, statements)
+    query_code = sentence_code(query, slots, statements)
+    targets = "".join(f"s{slot}, " for slot in range(len(symbols))) or "_"
+    lines = ["def check(models):", f"    for {targets} in models:"]
+    lines.extend(f"        {statement}" for statement in statements)
+    lines.append(f"        if {knowledge_code} and not {query_code}:")
+    lines.append("            return False")
+    lines.append("    return True")
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["check"](itertools.product((False, True), repeat=len(symbols)))
+
+# Simbolos que model_check_bits evalua a la vez como columnas de bits: con
+# mas, el resto se recorre por bloques de 2^TRUTH_TABLE_BITS modelos
+TRUTH_TABLE_BITS = 20
+
+def truth_table(sentence, columns, full):
+    """Returns the bit column of a sentence: bit m is its value in model m."""
+
+    # Cada conectiva es una sola operacion sobre todos los modelos a la vez
+    def table(sentence):
+        if isinstance(sentence, Symbol):
+            return columns[sentence.name]
+        if isinstance(sentence, Not):
+            return full ^ table(sentence.operand)
+        if isinstance(sentence, And):
+            bits = full
+            for conjunct in sentence.conjuncts:
+                bits &= table(conjunct)
+            return bits
+        if isinstance(sentence, Or):
+            bits = 0
+            for disjunct in sentence.disjuncts:
+                bits |= table(disjunct)
+            return bits
+        if isinstance(sentence, Implication):
+            return (full ^ table(sentence.antecedent)) | table(sentence.consequent)
+        if isinstance(sentence, Biconditional):
+            return full ^ (table(sentence.left) ^ table(sentence.right))
+        raise TypeError("must be a logical sentence")
+
+    return table(sentence)
+
+def symbol_columns(count):
+    """Returns the bit columns of count symbols over their 2^count models."""
+    columns = []
+    for i in range(count):
+        # Bloque de 2^i ceros y 2^i unos, repetido hasta cubrir todos los modelos
+        width = 2 << i
+        column = ((1 << (1 << i)) - 1) << (1 << i)
+        while width < 1 << count:
+            column |= column << width
+            width *= 2
+        columns.append(column)
+    return columns
+
+def model_check_bits(knowledge, query):
+    """Checks if knowledge base entails query over bit-parallel truth tables."""
+
+    # Los primeros simbolos son columnas de bits; los demas, si los hay,
+    # valen todo ceros o todo unos en cada bloque de modelos
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    low, high = symbols[:TRUTH_TABLE_BITS], symbols[TRUTH_TABLE_BITS:]
+    full = (1 << (1 << len(low))) - 1
+    columns = dict(zip(low, symbol_columns(len(low))))
+    for values in itertools.product((0, full), repeat=len(high)):
+        columns.update(zip(high, values))
+        # Un modelo de la base donde la consulta es falsa refuta el entrañamiento
+        if truth_table(knowledge, columns, full) & ~truth_table(query, columns, full):
+            return False
+    return True